@@ -4,11 +4,17 @@ Route
 """
 
 from api.v1.views import app_views, Amenity
+from api.v1.views.cache import cached
+from api.v1.views.conditional import etag, etag_of, not_modified
+from api.v1.views.pagination import paginated
+from api.v1.views.streaming import streamed
 from flask import jsonify, abort, request
 from models import storage
+from models.base_model import to_dicts
 
 
 @app_views.route('/amenities', strict_slashes=False, methods=['GET'])
+@cached(Amenity)
 def all_amenities():
     """ Method for the "/amenities" path GET
     Returns all amenities
@@ -36,11 +42,17 @@ def all_amenities():
             }
           ]
     """
-    amenities = storage.all(Amenity)
-    amenities = [amenity.to_dict() for amenity in amenities.values()]
-    return jsonify(amenities), 200
+    response = not_modified(etag(storage.version(Amenity)))
+    if response is not None:
+        return response
+    response = paginated(Amenity)
+    if response is not None:
+        return response
+    return streamed(to_dicts(storage.stream(Amenity)))
 
-    @app_views.route('/amenities/<id>', strict_slashes=False, methods=['GET'])
+
+@app_views.route('/amenities/<id>', strict_slashes=False, methods=['GET'])
+@cached(Amenity)
 def get_amenity(id):
     """ Method for the "/amenities/<id>" path GET
     Returns amenity by id
@@ -70,11 +82,14 @@ def get_amenity(id):
     amenity = storage.get(Amenity, id)
     if amenity:
         amenity = amenity.to_dict()
+        response = not_modified(etag_of(amenity))
+        if response is not None:
+            return response
         return jsonify(amenity), 200
     return abort(404)
 
 
-    @app_views.route('/amenities/<id>', strict_slashes=False, methods=['DELETE'])
+@app_views.route('/amenities/<id>', strict_slashes=False, methods=['DELETE'])
 def delete_amenity(id):
     """Removes amenity by id"""
     amenity = storage.get(Amenity, id)
@@ -0,0 +1,209 @@
+#!/usr/bin/python3
+"""
+Response cache for the read routes, invalidated by storage writes
+"""
+
+from api.v1.views.conditional import variant
+from collections import OrderedDict
+from flask import Response, g, make_response, request
+import functools
+from models import storage
+from os import getenv
+import threading
+import time
+
+
+class LocalCache:
+    """
+    Least recently used cache of at most max_bytes of values, each
+    expiring ttl seconds after it was set. Entries are tagged when set and
+    evict drops every entry of a tag.
+    """
+
+    def __init__(self, max_bytes=16777216, ttl=60.0):
+        """Instantiate an empty cache"""
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # integer - total size of the entries, as given to set
+        self.nbytes = 0
+        # OrderedDict - key to (expiry, value, size, tags), oldest first
+        self.__entries = OrderedDict()
+        # dictionary - tag to the set of keys of its entries
+        self.__tagged = {}
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """returns the value stored under key, or None"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self.__drop(key)
+                return None
+            self.__entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, size, tags=()):
+        """
+        stores value, taking size bytes, under key and its tags, evicting
+        the least recently used entries beyond max_bytes; a value larger
+        than max_bytes is not stored
+        """
+        with self.__lock:
+            self.__drop(key)
+            if size > self.max_bytes:
+                return
+            self.__entries[key] = (time.monotonic() + self.ttl, value, size,
+                                   tuple(tags))
+            self.nbytes += size
+            for tag in tags:
+                self.__tagged.setdefault(tag, set()).add(key)
+            while self.nbytes > self.max_bytes:
+                self.__drop(next(iter(self.__entries)))
+
+    def evict(self, tag):
+        """drops every entry stored under tag"""
+        with self.__lock:
+            for key in self.__tagged.pop(tag, ()):
+                self.__drop(key)
+
+    def __drop(self, key):
+        """removes the entry of key, if any, from the entries and tags"""
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return
+        self.nbytes -= entry[2]
+        for tag in entry[3]:
+            keys = self.__tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.__tagged[tag]
+
+    def __len__(self):
+        """returns the number of entries, expired or not"""
+        return len(self.__entries)
+
+
+class ResponseCache:
+    """
+    Caches the 200 responses of GET routes by the variant of the request
+    (see conditional.variant) and the storage version of the classes they
+    depend on, which every process moves on each write, so that an entry
+    built before a write is never read again. Storage also calls
+    invalidate with the name of a class whenever this process changes its
+    objects, which evicts the entries depending on it right away.
+    """
+
+    def __init__(self, backend):
+        """Instantiate a cache over backend with zeroed counters"""
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def invalidate(self, name):
+        """evicts every response depending on class name"""
+        self.backend.evict(name)
+        self.invalidations += 1
+
+    def key(self, names):
+        """returns the key of the current request given its dependencies"""
+        parts = variant() + (storage.version(names),)
+        return "\0".join(str(part) for part in parts)
+
+    def stats(self):
+        """returns the hit, miss and invalidation counters"""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.backend), "bytes": self.backend.nbytes}
+
+
+# integer - bytes of responses kept, 0 disables the cache
+cache_bytes = int(getenv('HBNB_API_CACHE_BYTES', '16777216'))
+# float - seconds a response is kept
+cache_ttl = float(getenv('HBNB_API_CACHE_TTL', '60'))
+response_cache = ResponseCache(LocalCache(cache_bytes, cache_ttl))
+storage.subscribe(response_cache.invalidate)
+
+
+def store(key, body, status, headers, etag, names):
+    """stores a response body and what is needed to send it again"""
+    size = len(key) + len(body) + sum(len(name) + len(value)
+                                      for name, value in headers)
+    response_cache.backend.set(key, (body, status, headers, etag), size,
+                               names)
+
+
+def buffered(chunks, key, status, headers, etag, names):
+    """
+    Yields the chunks of a streamed response while keeping a copy, which
+    is stored once the last chunk is sent; the copy is dropped as soon as
+    it outgrows the cache, so a large list is still streamed in bounded
+    memory and a response cut short is never stored.
+    """
+    parts = []
+    size = 0
+    try:
+        for chunk in chunks:
+            yield chunk
+            if parts is not None:
+                data = chunk.encode() if isinstance(chunk, str) else chunk
+                size += len(data)
+                if size > response_cache.backend.max_bytes:
+                    parts = None
+                else:
+                    parts.append(data)
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+    if parts is not None:
+        store(key, b"".join(parts), status, headers, etag, names)
+
+
+def cached(*deps):
+    """
+    Decorates a GET view so that its 200 responses are served from
+    response_cache until an object of one of the deps classes changes.
+    Streamed responses are still streamed, their body being stored once
+    sent if it fits in the cache.
+    """
+    names = [cls.__name__ for cls in deps]
+
+    def decorator(view):
+        """wraps view with the cache lookup"""
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            """returns the cached response or builds and caches it"""
+            if cache_bytes <= 0 or request.method != "GET":
+                return view(*args, **kwargs)
+            key = response_cache.key(names)
+            entry = response_cache.backend.get(key)
+            if entry is not None:
+                response_cache.hits += 1
+                body, status, headers, etag = entry
+                g.etag = etag
+                if etag is not None and \
+                        request.if_none_match.contains_weak(etag[0]):
+                    response = Response(status=304)
+                else:
+                    response = Response(body, status=status,
+                                        headers=headers)
+                response.headers["X-Cache"] = "HIT"
+                return response
+            response_cache.misses += 1
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                entry = (key, response.status_code, list(response.headers),
+                         g.get("etag"), names)
+                if response.is_streamed:
+                    response.response = buffered(response.response, *entry)
+                else:
+                    store(entry[0], response.get_data(), *entry[1:])
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
@@ -3,8 +3,12 @@
 Script for the cities API RESTful API
 """
 from api.v1.views import app_views, State, City
+from api.v1.views.conditional import etag, etag_of, not_modified
+from api.v1.views.pagination import paginated
+from api.v1.views.streaming import streamed
 from flask import jsonify, abort, request
 from models import storage
+from models.base_model import to_dicts
 
 
 @app_views.route('/states/<state_id>/cities', strict_slashes=False,
@@ -56,12 +60,18 @@ def get_cities_state(state_id):
     """
     state = storage.get(State, state_id)
     if state:
-        cities = [city.to_dict() for city in state.cities]
-        return jsonify(cities), 200
+        response = not_modified(etag(storage.version(City)))
+        if response is not None:
+            return response
+        response = paginated(City, 'state_id', state.id)
+        if response is not None:
+            return response
+        return streamed(to_dicts(storage.stream(City, attr='state_id',
+                                                value=state.id)))
     return abort(404)
 
 
-    @app_views.route('/cities/<city_id>', strict_slashes=False, methods=['GET'])
+@app_views.route('/cities/<city_id>', strict_slashes=False, methods=['GET'])
 def get_city(city_id):
     """ Method for the "/cities/<city_id>" path GET
     Returns City by id
@@ -92,6 +102,9 @@ def get_city(city_id):
     city = storage.get(City, city_id)
     if city:
         city = city.to_dict()
+        response = not_modified(etag_of(city))
+        if response is not None:
+            return response
         return jsonify(city), 200
     return abort(404)
 
@@ -125,7 +138,7 @@ def delete_city(city_id):
     return abort(404)
 
 
-    @app_views.route('/states/<state_id>/cities', strict_slashes=False,
+@app_views.route('/states/<state_id>/cities', strict_slashes=False,
                  methods=['POST'])
 def create_city(state_id):
     """ Method for the "/states/<state_id>/cities" path POST
@@ -178,9 +191,6 @@ def create_city(state_id):
     state = storage.get(State, state_id)
     if not bool(state):
         return abort(404)
-
-
-     body = request.get_json(silent=True)
     if body is None:
         return jsonify({'error': 'Not a JSON'}), 400
 
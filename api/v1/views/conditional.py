@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+ETags and conditional GET for the read routes
+"""
+
+from api.v1.views import app_views
+from api.v1.views.streaming import negotiated
+from flask import Response, g, request
+import hashlib
+import json
+from os import getenv
+
+# integer - seconds clients may reuse a response without revalidating it
+max_age = int(getenv('HBNB_API_MAX_AGE', '0'))
+# tuple - the query arguments the read routes look at
+query_args = ("limit", "cursor")
+
+
+def variant():
+    """
+    returns what a read response depends on besides storage: the path,
+    the arguments of query_args present and the negotiated media type,
+    so that other query arguments or Accept headers negotiating the same
+    type share one ETag and one cache entry
+    """
+    args = tuple((name, request.args[name]) for name in query_args
+                 if name in request.args)
+    return (request.path, args, negotiated())
+
+
+def etag(*parts):
+    """returns a strong entity tag built from parts and the request"""
+    parts += variant()
+    raw = "\0".join(str(part) for part in parts)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def etag_of(value):
+    """
+    returns the entity tag of the JSON body value is sent as, so that it
+    changes with the content itself rather than with a timestamp that may
+    be stored to the second
+    """
+    return etag(json.dumps(value, sort_keys=True, default=str))
+
+
+def not_modified(tag, private=False):
+    """
+    Records tag as the ETag of the current GET response and returns an
+    empty 304 response if the client already has it (If-None-Match), or
+    None to let the route build the response.
+    """
+    g.etag = (tag, private)
+    if request.if_none_match.contains_weak(tag):
+        return Response(status=304)
+    return None
+
+
+@app_views.after_request
+def add_etag(response):
+    """adds the ETag and Cache-Control recorded by not_modified"""
+    tag, private = g.pop("etag", (None, False))
+    if tag is None or response.status_code not in (200, 304):
+        return response
+    response.set_etag(tag)
+    response.vary.add("Accept")
+    if private:
+        response.cache_control.private = True
+    else:
+        response.cache_control.public = True
+    if max_age > 0:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+    return response
@@ -2,6 +2,8 @@
 """Route Index"""
 
 from api.v1.views import app_views, Place, City, Amenity, Review, State, User
+from api.v1.views.cache import cached, response_cache
+from api.v1.views.conditional import etag, not_modified
 from flask import jsonify
 from models import storage
 
@@ -9,18 +11,32 @@ from models import storage
 @app_views.route('/status', strict_slashes=False, methods=['GET'])
 def status():
     """Return API status"""
+    response = not_modified(etag())
+    if response is not None:
+        return response
     return jsonify({"status": "OK"}), 200
 
 
 @app_views.route('/stats', strict_slashes=False, methods=['GET'])
+@cached(Amenity, City, Place, Review, State, User)
 def stats():
     """Return API stats of objects"""
+    response = not_modified(etag(storage.version()))
+    if response is not None:
+        return response
+    counts = storage.counts()
     stats = {
-        "amenities": storage.count(Amenity),
-        "cities": storage.count(City),
-        "places": storage.count(Place),
-        "reviews": storage.count(Review),
-        "states": storage.count(State),
-        "users": storage.count(User)
+        "amenities": counts[Amenity.__name__],
+        "cities": counts[City.__name__],
+        "places": counts[Place.__name__],
+        "reviews": counts[Review.__name__],
+        "states": counts[State.__name__],
+        "users": counts[User.__name__]
     }
     return jsonify(stats), 200
+
+
+@app_views.route('/stats/cache', strict_slashes=False, methods=['GET'])
+def cache_stats():
+    """Return the hit and miss counters of the response cache"""
+    return jsonify(response_cache.stats()), 200
@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""
+Keyset pagination for the list routes
+"""
+
+import base64
+from flask import jsonify, request
+from models import storage
+from models.base_model import parse_time, time, to_dicts
+
+# integer - largest page a client may ask for
+max_limit = 1000
+
+
+def encode_cursor(obj):
+    """returns the opaque cursor pointing just after obj"""
+    raw = obj.created_at.strftime(time) + " " + obj.id
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Returns the (created_at, id) tuple encoded by encode_cursor, raising
+    ValueError if the cursor is malformed or its time has a UTC offset,
+    which could not be compared with the naive times of the objects.
+    """
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    created_at, id = raw.decode().split(" ", 1)
+    created_at = parse_time(created_at)
+    if created_at.tzinfo is not None:
+        raise ValueError("cursor time has a UTC offset")
+    return created_at, id
+
+
+def paginated(cls, attr=None, value=None):
+    """
+    Returns the JSON response for one page of the objects of cls (those
+    whose attr equals value if attr is given) when the request has a
+    limit or cursor argument, or None to let the route list everything.
+    The page is ordered by (created_at, id); when more objects follow, a
+    Link header and an X-Next-Cursor header point to the next page.
+    """
+    if "limit" not in request.args and "cursor" not in request.args:
+        return None
+    try:
+        limit = int(request.args.get("limit", max_limit))
+    except ValueError:
+        limit = 0
+    if not 0 < limit <= max_limit:
+        return jsonify({'error': 'Invalid limit'}), 400
+    after = None
+    if request.args.get("cursor"):
+        try:
+            after = decode_cursor(request.args["cursor"])
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+    objs = storage.page(cls, limit + 1, after, attr, value)
+    response = jsonify(list(to_dicts(objs[:limit])))
+    if len(objs) > limit:
+        cursor = encode_cursor(objs[limit - 1])
+        url = "{}?limit={:d}&cursor={}".format(request.base_url, limit,
+                                               cursor)
+        response.headers["Link"] = '<{}>; rel="next"'.format(url)
+        response.headers["X-Next-Cursor"] = cursor
+    return response, 200
@@ -4,8 +4,14 @@ Route Places
 """
 
 from api.v1.views import app_views, Place, City, User
+from api.v1.views.cache import cached
+from api.v1.views.conditional import etag, etag_of, not_modified
+from api.v1.views.pagination import paginated
+from api.v1.views.streaming import streamed
 from flask import jsonify, abort, request
 from models import storage
+from models.base_model import to_dicts
+from models.engine.columns import parse_ranges
 
 
 @app_views.route('/cities/<id>/places', strict_slashes=False, methods=['GET'])
@@ -56,14 +62,21 @@ def get_city_place(id):
       404:
         description: When data not found
     """
-     city = storage.get(City, id)
+    city = storage.get(City, id)
     if city:
-        places = [place.to_dict() for place in city.places]
-        return jsonify(places), 200
+        response = not_modified(etag(storage.version(Place)))
+        if response is not None:
+            return response
+        response = paginated(Place, 'city_id', city.id)
+        if response is not None:
+            return response
+        return streamed(to_dicts(storage.stream(Place, attr='city_id',
+                                                value=city.id)))
     return abort(404)
 
 
 @app_views.route('/places/<id>', strict_slashes=False, methods=['GET'])
+@cached(Place)
 def get_place(id):
     """ Method for the "/places/<id>" path GET
     Returns Place by id
@@ -102,6 +115,9 @@ def get_place(id):
     place = storage.get(Place, id)
     if place:
         place = place.to_dict()
+        response = not_modified(etag_of(place))
+        if response is not None:
+            return response
         return jsonify(place), 200
     return abort(404)
 
@@ -159,3 +175,99 @@ def update_place(id):
         place.save()
         return jsonify(place.to_dict()), 200
     return abort(404)
+
+
+@app_views.route('/places_search', strict_slashes=False, methods=['POST'])
+def search_places():
+    """ Method for the "/places_search" path POST
+    Returns the Place objects matching the states, cities and amenities
+    ---
+    tags:
+      - Place
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          properties:
+            states:
+              type: array
+              description: IDs of State, all their cities are searched
+            cities:
+              type: array
+              description: IDs of City, added to the cities of states
+            amenities:
+              type: array
+              description: IDs of Amenity, a Place must have all of them
+            ranges:
+              type: object
+              description: Numeric attribute to a value, a [min, max]
+                pair or {"min", "max"}, e.g. {"max_guest": [4, null]}
+    responses:
+      200:
+        description: A list of Place objects, all of them if no filter
+      400:
+        description: When the body is not a JSON object
+        examples:
+          {
+            "error": "Not a JSON"
+          }
+        examples:
+          {
+            "error": "Invalid ranges"
+          }
+        examples:
+          {
+            "error": "Invalid states"
+          }
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({'error': 'Not a JSON'}), 400
+    ids = {}
+    for name in ('states', 'cities', 'amenities'):
+        value = body.get(name)
+        if value is None:
+            value = []
+        if not isinstance(value, list) or \
+                not all(isinstance(id, str) for id in value):
+            return jsonify({'error': 'Invalid ' + name}), 400
+        ids[name] = set(value)
+    states, cities, amenities = ids['states'], ids['cities'], ids['amenities']
+    ranges = body.get('ranges') or {}
+    try:
+        ranges = parse_ranges(ranges)
+    except (AttributeError, TypeError, ValueError):
+        return jsonify({'error': 'Invalid ranges'}), 400
+
+    place_ids = None
+    if amenities:
+        place_ids = storage.places_with_amenities(amenities)
+    if ranges:
+        in_ranges = storage.places_in_ranges(ranges)
+        if place_ids is None:
+            place_ids = in_ranges
+        else:
+            place_ids &= in_ranges
+
+    if states or cities:
+        city_ids = set(cities)
+        if states:
+            city_ids.update(city.id for city in
+                            storage.related(City, 'state_id',
+                                            states).values())
+        places = storage.related(Place, 'city_id', city_ids).values()
+        if place_ids is not None:
+            places = [place for place in places if place.id in place_ids]
+    elif place_ids is not None:
+        places = storage.related(Place, 'id', place_ids).values()
+    else:
+        places = storage.stream(Place)
+    return streamed(place_dict(place) for place in places)
+
+
+def place_dict(place):
+    """returns place.to_dict() without the amenities relationship"""
+    place = place.to_dict()
+    place.pop('amenities', None)
+    return place
@@ -3,8 +3,12 @@
 Script for the cities API RESTful API
 """
 from api.v1.views import app_views, Place, Review, User
+from api.v1.views.conditional import etag, etag_of, not_modified
+from api.v1.views.pagination import paginated
+from api.v1.views.streaming import streamed
 from flask import jsonify, abort, request
 from models import storage
+from models.base_model import to_dicts
 
 
 @app_views.route('/places/<place_id>/reviews', strict_slashes=False,
@@ -54,8 +58,14 @@ def get_reviews_places(place_id):
     """
     place = storage.get(Place, place_id)
     if place:
-        reviews = [review.to_dict() for review in place.reviews]
-        return jsonify(reviews), 200
+        response = not_modified(etag(storage.version(Review)))
+        if response is not None:
+            return response
+        response = paginated(Review, 'place_id', place.id)
+        if response is not None:
+            return response
+        return streamed(to_dicts(storage.stream(Review, attr='place_id',
+                                                value=place.id)))
     return abort(404)
 
 
@@ -95,6 +105,9 @@ def get_review(review_id):
     review = storage.get(Review, review_id)
     if review:
         review = review.to_dict()
+        response = not_modified(etag_of(review))
+        if response is not None:
+            return response
         return jsonify(review), 200
     return abort(404)
 
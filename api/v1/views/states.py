@@ -4,11 +4,17 @@ Script for the REST API of State class model
 """
 
 from api.v1.views import app_views, State
+from api.v1.views.cache import cached
+from api.v1.views.conditional import etag, etag_of, not_modified
+from api.v1.views.pagination import paginated
+from api.v1.views.streaming import streamed
 from flask import jsonify, abort, request
 from models import storage
+from models.base_model import to_dicts
 
 
 @app_views.route('/states', strict_slashes=False, methods=['GET'])
+@cached(State)
 def all_states():
     """ Method for the "/states" path GET
     Returns all states
@@ -36,12 +42,17 @@ def all_states():
             }
           ]
     """
-    states = storage.all(State)
-    states = [state.to_dict() for state in states.values()]
-    return jsonify(states), 200
+    response = not_modified(etag(storage.version(State)))
+    if response is not None:
+        return response
+    response = paginated(State)
+    if response is not None:
+        return response
+    return streamed(to_dicts(storage.stream(State)))
 
 
 @app_views.route('/states/<id>', strict_slashes=False, methods=['GET'])
+@cached(State)
 def get_state(id):
     """ Method for the "/states/<id>" path GET
     Returns state by id
@@ -68,10 +79,12 @@ def get_state(id):
       404:
         description: Object not found
     """
-    states = storage.all(State)
     state = storage.get(State, id)
     if state:
         state = state.to_dict()
+        response = not_modified(etag_of(state))
+        if response is not None:
+            return response
         return jsonify(state), 200
     return abort(404)
 
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""
+Streamed JSON responses for the list routes
+"""
+
+from flask import Response, json, request, stream_with_context
+
+# integer - objects serialized per chunk sent to the client
+chunk_size = 100
+# list - media types a list can be sent as, the first being the default
+mimetypes = ["application/json", "application/x-ndjson"]
+
+
+def negotiated():
+    """returns the media type of mimetypes the client prefers"""
+    return request.accept_mimetypes.best_match(mimetypes, mimetypes[0])
+
+
+def streamed(dicts):
+    """
+    Returns a response that serializes dicts one chunk at a time instead
+    of building the whole list first: a JSON array, or one JSON object per
+    line if the client prefers application/x-ndjson.
+    """
+    mimetype = negotiated()
+
+    def ndjson():
+        """yields chunks of newline-delimited JSON objects"""
+        chunk = []
+        for obj in dicts:
+            chunk.append(json.dumps(obj) + "\n")
+            if len(chunk) == chunk_size:
+                yield "".join(chunk)
+                chunk = []
+        yield "".join(chunk)
+
+    def array():
+        """yields chunks of one JSON array"""
+        chunk = ["["]
+        sep = ""
+        for obj in dicts:
+            chunk.append(sep + json.dumps(obj))
+            sep = ","
+            if len(chunk) >= chunk_size:
+                yield "".join(chunk)
+                chunk = []
+        chunk.append("]\n")
+        yield "".join(chunk)
+
+    body = ndjson() if mimetype == "application/x-ndjson" else array()
+    return Response(stream_with_context(body), mimetype=mimetype)
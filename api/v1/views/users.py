@@ -4,8 +4,12 @@ Route
 """
 
 from api.v1.views import app_views, User
+from api.v1.views.conditional import etag, etag_of, not_modified
+from api.v1.views.pagination import paginated
+from api.v1.views.streaming import streamed
 from flask import jsonify, abort, request
 from models import storage
+from models.base_model import to_dicts
 
 
 @app_views.route('/users', strict_slashes=False, methods=['GET'])
@@ -42,9 +46,13 @@ def all_users():
             }
           ]
     """
-    users = storage.all(User)
-    users = [user.to_dict() for user in users.values()]
-    return jsonify(users), 200
+    response = not_modified(etag(storage.version(User)), private=True)
+    if response is not None:
+        return response
+    response = paginated(User)
+    if response is not None:
+        return response
+    return streamed(to_dicts(storage.stream(User)))
 
 
 @app_views.route('/users/<id>', strict_slashes=False, methods=['GET'])
@@ -80,6 +88,9 @@ def get_user(id):
     user = storage.get(User, id)
     if user:
         user = user.to_dict()
+        response = not_modified(etag_of(user), private=True)
+        if response is not None:
+            return response
         return jsonify(user), 200
     return abort(404)
 
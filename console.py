@@ -7,6 +7,7 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine.columns import parse_ranges
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -96,7 +97,7 @@ class HBNBCommand(cmd.Cmd):
             if len(args) > 1:
                 key = args[0] + "." + args[1]
                 if key in models.storage.all():
-                    models.storage.all().pop(key)
+                    models.storage.delete(models.storage.all()[key])
                     models.storage.save()
                 else:
                     print("** no instance found **")
@@ -122,6 +123,42 @@ class HBNBCommand(cmd.Cmd):
         print(", ".join(obj_list), end="")
         print("]")
 
+    def do_search(self, arg):
+        """Prints the places whose numeric attributes are within ranges:
+        search Place <attribute>=<min>:<max> ..., either bound optional,
+        or <attribute>=<value> for equality"""
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print("** class name missing **")
+            return False
+        if args[0] != "Place":
+            print("** class doesn't exist **")
+            return False
+        ranges = {}
+        try:
+            for arg in args[1:]:
+                key, value = arg.split("=", 1)
+                bounds = [float(bound) if bound else None
+                          for bound in value.split(":")]
+                if len(bounds) == 1 and bounds[0] is not None:
+                    ranges[key] = bounds[0]
+                elif len(bounds) == 2:
+                    ranges[key] = bounds
+                else:
+                    raise ValueError("expected <value> or <min>:<max>")
+            ranges = parse_ranges(ranges)
+        except ValueError:
+            print("** invalid range **")
+            return False
+        place_ids = models.storage.places_in_ranges(ranges)
+        places = models.storage.related(Place, "id", place_ids)
+        obj_list = []
+        for key in sorted(places):
+            obj_list.append(str(places[key]))
+        print("[", end="")
+        print(", ".join(obj_list), end="")
+        print("]")
+
     def do_update(self, arg):
         """Update an instance based on the class name, id, attribute & value"""
         args = shlex.split(arg)
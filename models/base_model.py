@@ -5,13 +5,51 @@ Contains class BaseModel
 
 from datetime import datetime
 import models
+from operator import methodcaller
 from os import getenv
+import os
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
-import uuid
+import weakref
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# the C parser of the ISO 8601 strings written with the time format,
+# several times faster than datetime.strptime
+parse_time = datetime.fromisoformat
+# names of the datetime attributes serialized with the time format
+timestamps = ("created_at", "updated_at")
+
+
+# WeakKeyDictionary - instance to {attribute: (datetime, formatted)},
+# so that to_dict formats a timestamp again only once it changes
+formatted = weakref.WeakKeyDictionary()
+
+
+def format_time(value):
+    """returns a naive datetime in the time format, faster than strftime"""
+    return value.isoformat(timespec="microseconds")
+
+
+def new_id():
+    """
+    Returns a random version 4 UUID string, like str(uuid.uuid4()) at
+    a third of its cost.
+    """
+    raw = bytearray(os.urandom(16))
+    raw[6] = raw[6] & 0x0f | 0x40
+    raw[8] = raw[8] & 0x3f | 0x80
+    h = raw.hex()
+    return "-".join((h[:8], h[8:12], h[12:16], h[16:20], h[20:]))
+
+
+def to_dicts(objs):
+    """
+    Returns an iterator over the to_dict() of every object of objs,
+    calling the method from C instead of a Python loop.
+    """
+    return map(methodcaller("to_dict"), objs)
+
 
 if models.storage_t == "db":
     Base = declarative_base()
@@ -19,36 +57,89 @@ else:
     Base = object
 
 
+class Timestamp:
+    """datetime attribute kept as its stored string until first read"""
+
+    def __set_name__(self, owner, name):
+        """remembers the name of the attribute"""
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """returns the datetime, parsing the stored string if needed"""
+        if obj is None:
+            return self
+        try:
+            value = obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+        if type(value) is str:
+            value = parse_time(value)
+            obj.__dict__[self.name] = value
+        return value
+
+    def __set__(self, obj, value):
+        """stores the value as is"""
+        obj.__dict__[self.name] = value
+
+
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
+    else:
+        created_at = Timestamp()
+        updated_at = Timestamp()
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
+        now = None
         if kwargs:
-            for key, value in kwargs.items():
-                if key != "__class__":
-                    setattr(self, key, value)
-            if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
-            else:
-                self.created_at = datetime.utcnow()
-            if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
-            else:
-                self.updated_at = datetime.utcnow()
+            kwargs.pop("__class__", None)
+            for name in timestamps:
+                if type(kwargs.get(name, None)) is str:
+                    kwargs[name] = parse_time(kwargs[name])
+                else:
+                    kwargs[name] = now = now or datetime.utcnow()
             if kwargs.get("id", None) is None:
-                self.id = str(uuid.uuid4())
+                kwargs["id"] = new_id()
         else:
-            self.id = str(uuid.uuid4())
-            self.created_at = datetime.utcnow()
-            self.updated_at = self.created_at
+            now = datetime.utcnow()
+            kwargs = {"id": new_id(), "created_at": now,
+                      "updated_at": now}
+        if models.storage_t == "db" or \
+                not self.__properties().isdisjoint(kwargs):
+            for key, value in kwargs.items():
+                setattr(self, key, value)
+        else:
+            self.__dict__.update(kwargs)
+
+    @classmethod
+    def __properties(cls):
+        """returns the names of the properties of the class"""
+        names = cls.__dict__.get("_BaseModel__names")
+        if names is None:
+            names = frozenset(name for name in dir(cls)
+                              if isinstance(getattr(cls, name, None),
+                                            property))
+            cls.__names = names
+        return names
+
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute, re-indexing foreign keys in storage"""
+            if name.endswith("_id") and "id" in self.__dict__:
+                old = getattr(self, name, None)
+                super().__setattr__(name, value)
+                models.storage.reindex(self, name, old)
+            else:
+                super().__setattr__(name, value)
 
     def __str__(self):
         """String representation of the BaseModel class"""
+        for name in timestamps:
+            getattr(self, name, None)
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
                                          self.__dict__)
 
@@ -61,10 +152,19 @@ class BaseModel:
     def to_dict(self):
         """returns a dictionary containing all keys/values of the instance"""
         new_dict = self.__dict__.copy()
-        if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
-        if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+        cache = None
+        for name in timestamps:
+            value = new_dict.get(name)
+            if value is None or type(value) is str:
+                continue
+            if cache is None:
+                cache = formatted.get(self)
+                if cache is None:
+                    cache = formatted[self] = {}
+            cached = cache.get(name)
+            if cached is None or cached[0] is not value:
+                cached = cache[name] = (value, format_time(value))
+            new_dict[name] = cached[1]
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+"""
+Contains the compact __slots__ variants of the models for file storage
+"""
+
+from datetime import datetime, timedelta
+import models
+from models.amenity import Amenity
+from models.base_model import BaseModel, parse_time, format_time
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import sys
+
+# datetime - the naive UTC time the integer timestamps count from
+epoch = datetime(1970, 1, 1)
+# timedelta - the unit of the integer timestamps
+microsecond = timedelta(microseconds=1)
+
+
+def to_epoch(value):
+    """returns a naive UTC datetime, or its string, in microseconds"""
+    if type(value) is str:
+        value = parse_time(value)
+    return (value - epoch) // microsecond
+
+
+def from_epoch(value):
+    """returns the naive UTC datetime of a number of microseconds"""
+    return epoch + timedelta(microseconds=value)
+
+
+class CompactModel:
+    """
+    Mixin of the compact models: attributes live in __slots__, foreign
+    keys are interned and timestamps are integers. The regular classes
+    they derive from have no __slots__, so instances still get a __dict__
+    slot; it stays empty unless an attribute the model does not declare
+    is set.
+    """
+    __slots__ = ()
+
+    @property
+    def created_at(self):
+        """the creation datetime"""
+        return from_epoch(self._created)
+
+    @created_at.setter
+    def created_at(self, value):
+        """stores the creation datetime as microseconds"""
+        self._created = to_epoch(value)
+
+    @property
+    def updated_at(self):
+        """the datetime of the last update"""
+        return from_epoch(self._updated)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        """stores the datetime of the last update as microseconds"""
+        self._updated = to_epoch(value)
+
+    def __getattr__(self, name):
+        """returns the class default of a slot that was never set"""
+        try:
+            return type(self)._defaults[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        """sets an attribute, interning and re-indexing foreign keys"""
+        if name not in type(self)._known:
+            object.__setattr__(self, "_extra", True)
+        if name.endswith("_id"):
+            if type(value) is str:
+                value = sys.intern(value)
+            if self._has("id"):
+                old = getattr(self, name, None)
+                object.__setattr__(self, name, value)
+                models.storage.reindex(self, name, old)
+                return
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        """deletes an attribute, re-indexing foreign keys"""
+        old = getattr(self, name, None)
+        object.__delattr__(self, name)
+        if name.endswith("_id") and self._has("id"):
+            models.storage.reindex(self, name, old)
+
+    def _has(self, name):
+        """returns True if the slot name was set"""
+        try:
+            object.__getattribute__(self, name)
+        except AttributeError:
+            return False
+        return True
+
+    def _attributes(self):
+        """returns the set attributes with the timestamps as integers"""
+        attrs = {}
+        for name in type(self)._fields:
+            try:
+                attrs[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        if self._has("_extra"):
+            attrs.update(self.__dict__)
+        return attrs
+
+    @classmethod
+    def from_dict(cls, value):
+        """builds an instance from a to_dict() dictionary"""
+        obj = cls.__new__(cls)
+        for name, attr in value.items():
+            if name == "__class__":
+                continue
+            if name == "created_at" or name == "updated_at":
+                attr = to_epoch(attr)
+                name = "_created" if name == "created_at" else "_updated"
+            elif name not in cls._known:
+                object.__setattr__(obj, "_extra", True)
+            if name.endswith("_id") and type(attr) is str:
+                attr = sys.intern(attr)
+            object.__setattr__(obj, name, attr)
+        return obj
+
+    def __str__(self):
+        """String representation of the model"""
+        attrs = self._attributes()
+        for name, slot in (("created_at", "_created"),
+                           ("updated_at", "_updated")):
+            if slot in attrs:
+                attrs[name] = from_epoch(attrs.pop(slot))
+        return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
+                                         attrs)
+
+    def to_dict(self):
+        """returns a dictionary containing all keys/values of the instance"""
+        new_dict = self._attributes()
+        for name, slot in (("created_at", "_created"),
+                           ("updated_at", "_updated")):
+            if slot in new_dict:
+                new_dict[name] = format_time(from_epoch(new_dict.pop(slot)))
+        new_dict["__class__"] = self.__class__.__name__
+        return new_dict
+
+
+def compact(cls, *extra):
+    """
+    Returns a subclass of cls with the same name that keeps id, the
+    timestamps, the plain class attributes of cls and extra in slots;
+    _known also lists its properties, which are not extra attributes.
+    """
+    defaults = {name: value for name, value in vars(cls).items()
+                if not (name.startswith("_") or callable(value) or
+                        isinstance(value, property))}
+    fields = ("id", "_created", "_updated") + tuple(defaults) + extra
+    new = type(cls.__name__, (CompactModel, cls),
+               {"__slots__": fields + ("_extra",), "__module__": __name__,
+                "__doc__": "compact " + cls.__name__,
+                "_fields": fields, "_defaults": defaults})
+    new._known = frozenset(fields + ("_extra",)) | frozenset(
+        name for name in dir(new)
+        if isinstance(getattr(new, name, None), property))
+    return new
+
+
+# dictionary - class name to its compact class, which only file storage
+# uses: the models are mapped by SQLAlchemy in DB mode
+classes = {}
+if models.storage_t != "db":
+    classes = {"Amenity": compact(Amenity, "place_id"),
+               "BaseModel": compact(BaseModel), "City": compact(City),
+               "Place": compact(Place), "Review": compact(Review),
+               "State": compact(State), "User": compact(User)}
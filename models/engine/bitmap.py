@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+Contains the AmenityBitmap class
+"""
+
+
+class AmenityBitmap:
+    """
+    Maps each amenity id to a bitset of place ordinals, kept in a Python
+    integer, so places having several amenities are found with bitwise ANDs
+    """
+
+    def __init__(self):
+        """Instantiate an empty bitmap index"""
+        # dictionary - place id to its ordinal, i.e. its bit position
+        self.ordinals = {}
+        # list - place id of each ordinal
+        self.place_ids = []
+        # dictionary - amenity id to the bitset of its place ordinals
+        self.bits = {}
+
+    def ordinal(self, place_id):
+        """returns the ordinal of a place, assigning the next one if new"""
+        ordinal = self.ordinals.get(place_id)
+        if ordinal is None:
+            ordinal = len(self.place_ids)
+            self.ordinals[place_id] = ordinal
+            self.place_ids.append(place_id)
+        return ordinal
+
+    def add(self, amenity_id, place_id):
+        """records that the place has the amenity"""
+        bit = 1 << self.ordinal(place_id)
+        self.bits[amenity_id] = self.bits.get(amenity_id, 0) | bit
+
+    def discard(self, amenity_id, place_id):
+        """records that the place no longer has the amenity"""
+        ordinal = self.ordinals.get(place_id)
+        if ordinal is not None and amenity_id in self.bits:
+            self.bits[amenity_id] &= ~(1 << ordinal)
+            if not self.bits[amenity_id]:
+                del self.bits[amenity_id]
+
+    def all_of(self, amenity_ids):
+        """returns the set of ids of the places having every amenity"""
+        amenity_ids = list(amenity_ids)
+        if not amenity_ids:
+            return set()
+        bits = self.bits.get(amenity_ids[0], 0)
+        for amenity_id in amenity_ids[1:]:
+            if not bits:
+                break
+            bits &= self.bits.get(amenity_id, 0)
+        found = set()
+        binary = bin(bits)[:1:-1]
+        position = binary.find("1")
+        while position != -1:
+            found.add(self.place_ids[position])
+            position = binary.find("1", position + 1)
+        return found
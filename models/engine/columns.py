@@ -0,0 +1,200 @@
+#!/usr/bin/python3
+"""
+Contains the PlaceColumns class
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+import threading
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# tuple - the numeric Place attributes kept as columns
+numeric = ("number_rooms", "number_bathrooms", "max_guest",
+           "price_by_night", "latitude", "longitude")
+
+
+def parse_ranges(ranges):
+    """
+    Returns {attribute: (low, high)} from a dictionary mapping numeric
+    Place attributes to a number (equality), a [low, high] pair where
+    either bound may be None, or a {"min": low, "max": high} dictionary.
+    Raises ValueError for unknown attributes or non-numeric bounds.
+    """
+    parsed = {}
+    for name, value in ranges.items():
+        if name not in numeric:
+            raise ValueError("not a numeric Place attribute: " + str(name))
+        if isinstance(value, dict):
+            value = (value.get("min"), value.get("max"))
+        elif not isinstance(value, (list, tuple)):
+            value = (value, value)
+        if len(value) != 2:
+            raise ValueError("expected [low, high] for " + name)
+        bounds = []
+        for bound in value:
+            if bound is not None and (isinstance(bound, bool) or
+                                      not isinstance(bound, (int, float))):
+                raise ValueError("expected a number for " + name)
+            bounds.append(bound)
+        parsed[name] = tuple(bounds)
+    return parsed
+
+
+class PlaceColumns:
+    """
+    Keeps the numeric attributes of every place in one array of doubles
+    per attribute, row by row, so range filters scan flat arrays instead
+    of Place objects. With NumPy installed the scans are vectorized,
+    otherwise the most selective range is found by bisecting the sorted
+    values of its column and only its rows are checked against the rest.
+    The sorted values are built on first use and then kept in order by
+    put and discard. A lock keeps put and discard from resizing an array
+    while select reads it.
+    """
+
+    def __init__(self):
+        """Instantiate an empty column store"""
+        # dictionary - place id to its row
+        self.rows = {}
+        # list - place id of each row, None for a free row
+        self.ids = []
+        # dictionary - attribute name to the array of its values, NaN
+        # where the place has none
+        self.columns = {name: array("d") for name in numeric}
+        # list - rows freed by discard, reused by put
+        self.free = []
+        # dictionary - attribute name to its sorted values and their rows,
+        # sorted by (value, row), without NaN
+        self.__sorted = {}
+        self.__lock = threading.Lock()
+
+    def put(self, place):
+        """stores or updates the numeric attributes of a place"""
+        with self.__lock:
+            row = self.rows.get(place.id)
+            if row is None:
+                if self.free:
+                    row = self.free.pop()
+                    self.ids[row] = place.id
+                else:
+                    row = len(self.ids)
+                    self.ids.append(place.id)
+                    for column in self.columns.values():
+                        column.append(float("nan"))
+                self.rows[place.id] = row
+            for name, column in self.columns.items():
+                value = getattr(place, name, None)
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    value = float("nan")
+                if name in self.__sorted:
+                    self.__unsort(name, column[row], row)
+                    self.__insort(name, value, row)
+                column[row] = value
+
+    def discard(self, place_id):
+        """forgets a place"""
+        with self.__lock:
+            row = self.rows.pop(place_id, None)
+            if row is not None:
+                self.ids[row] = None
+                for name, column in self.columns.items():
+                    if name in self.__sorted:
+                        self.__unsort(name, column[row], row)
+                    column[row] = float("nan")
+                self.free.append(row)
+
+    def __insort(self, name, value, row):
+        """inserts value at row in the sorted values of a column"""
+        if value == value:
+            keys, rows = self.__sorted[name]
+            lo, hi = bisect_left(keys, value), bisect_right(keys, value)
+            i = bisect_left(rows, row, lo, hi)
+            keys.insert(i, value)
+            rows.insert(i, row)
+
+    def __unsort(self, name, value, row):
+        """removes value at row from the sorted values of a column"""
+        if value == value:
+            keys, rows = self.__sorted[name]
+            lo, hi = bisect_left(keys, value), bisect_right(keys, value)
+            i = bisect_left(rows, row, lo, hi)
+            del keys[i]
+            del rows[i]
+
+    def select(self, ranges):
+        """
+        Returns the set of ids of the places whose attributes are within
+        the (low, high) bounds of ranges, None meaning unbounded. Free
+        rows and missing values hold NaN, which no bound matches.
+        """
+        with self.__lock:
+            if not ranges:
+                return set(self.rows)
+            if numpy is not None and self.ids:
+                return self.__select_numpy(ranges)
+            best = None
+            for name, (low, high) in ranges.items():
+                keys, rows = self.__order(name)
+                start = 0 if low is None else bisect_left(keys, low)
+                stop = len(keys) if high is None \
+                    else bisect_right(keys, high)
+                if best is None or stop - start < best[2] - best[1]:
+                    best = (name, start, stop)
+            name, start, stop = best
+            found = self.__order(name)[1][start:stop]
+            for other, (low, high) in ranges.items():
+                if other == name:
+                    continue
+                values = self.columns[other]
+                if low is not None and high is not None:
+                    found = [row for row in found
+                             if low <= values[row] <= high]
+                elif low is not None:
+                    found = [row for row in found if values[row] >= low]
+                elif high is not None:
+                    found = [row for row in found if values[row] <= high]
+                else:
+                    found = [row for row in found
+                             if values[row] == values[row]]
+            return {self.ids[row] for row in found}
+
+    def __order(self, name):
+        """
+        Returns the sorted values of a column and their rows, skipping
+        NaN; sorted on first use, then updated by put and discard.
+        """
+        order = self.__sorted.get(name)
+        if order is None:
+            values = self.columns[name]
+            rows = sorted((row for row in range(len(values))
+                           if values[row] == values[row]),
+                          key=values.__getitem__)
+            order = ([values[row] for row in rows], rows)
+            self.__sorted[name] = order
+        return order
+
+    def __select_numpy(self, ranges):
+        """
+        select() as boolean masks over NumPy views of the columns; the
+        views are released before the lock so that put can grow the
+        arrays again
+        """
+        mask = numpy.ones(len(self.ids), dtype=bool)
+        for name, (low, high) in ranges.items():
+            values = numpy.frombuffer(self.columns[name], dtype=numpy.float64)
+            mask &= ~numpy.isnan(values)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+            del values
+        return {self.ids[row] for row in numpy.flatnonzero(mask)}
+
+    def __len__(self):
+        """returns the number of places stored"""
+        return len(self.rows)
@@ -6,6 +6,8 @@ Contains the class DBStorage
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
+from models.engine.bitmap import AmenityBitmap
+from models.engine.ordering import sort_key
 from models.city import City
 from models.place import Place
 from models.review import Review
@@ -13,17 +15,138 @@ from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import BigInteger, Column, String, Table
+from sqlalchemy import and_, create_engine, event, func, or_, select
+from sqlalchemy.orm import configure_mappers, scoped_session, sessionmaker
+from sqlalchemy.orm.attributes import PASSIVE_NO_INITIALIZE, get_history
+from sqlalchemy.pool import QueuePool, StaticPool
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# create_engine argument: (environment variable, default)
+pool_settings = {"pool_size": ("HBNB_MYSQL_POOL_SIZE", 5),
+                 "max_overflow": ("HBNB_MYSQL_MAX_OVERFLOW", 10),
+                 "pool_recycle": ("HBNB_MYSQL_POOL_RECYCLE", 3600),
+                 "pool_timeout": ("HBNB_MYSQL_POOL_TIMEOUT", 30),
+                 "pool_pre_ping": ("HBNB_MYSQL_POOL_PRE_PING", 1)}
+# pragmas run on every new SQLite connection
+sqlite_pragmas = ("PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL",
+                  "PRAGMA foreign_keys=ON", "PRAGMA busy_timeout=5000",
+                  "PRAGMA temp_store=MEMORY", "PRAGMA cache_size=-65536")
+# Table - one counter per class name, incremented in the transaction of
+# every save that changes objects of the class, so that version() moves
+# with each commit of any process whatever the precision of updated_at
+if models.storage_t == 'db':
+    versions = Table('versions', Base.metadata,
+                     Column('name', String(60), primary_key=True),
+                     Column('counter', BigInteger, nullable=False))
+# names counted in versions: the classes, and place_amenity for the links
+# of places and amenities, which the amenity bitmap is built from
+version_names = tuple(classes) + ("place_amenity",)
+
+
+def pool_options():
+    """returns the create_engine pool arguments set by HBNB_MYSQL_POOL_*"""
+    options = {}
+    for arg, (name, default) in pool_settings.items():
+        options[arg] = int(getenv(name, default))
+    options["pool_pre_ping"] = bool(options["pool_pre_ping"])
+    return options
+
+
+def load_options(CLASS, paths):
+    """
+    Returns the loader options eagerly loading the relationship paths of
+    CLASS, e.g. "cities" or "cities.places": a collection is loaded by one
+    SELECT ... IN per level, a many-to-one is joined to its parent row.
+    """
+    configure_mappers()
+    options = []
+    for path in paths:
+        option, owner = None, CLASS
+        for name in path.split("."):
+            attr = getattr(owner, name)
+            strategy = "selectinload" if attr.property.uselist \
+                else "joinedload"
+            if option is None:
+                option = getattr(sqlalchemy.orm, strategy)(attr)
+            else:
+                option = getattr(option, strategy)(attr)
+            owner = attr.property.mapper.class_
+        options.append(option)
+    return options
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how many checkouts waited and for how long"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate the pool with zeroed counters"""
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        """checks a connection out, timing the wait for it"""
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sqlalchemy.exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def stats(self):
+        """returns the pool usage counters"""
+        return {"size": self.size(), "checked_out": self.checkedout(),
+                "overflow": self.overflow(), "checkouts": self.checkouts,
+                "timeouts": self.timeouts, "wait_total": self.wait_total,
+                "wait_max": self.wait_max}
+
+
+def sqlite_engine(url):
+    """
+    Returns an engine for a sqlite:// URL, in WAL mode with the pragmas
+    of sqlite_pragmas. An in-memory database shares one connection.
+    """
+    if url.rstrip("/") in ("sqlite:", "sqlite:/:memory:"):
+        engine = create_engine(url, poolclass=StaticPool,
+                               connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(url, poolclass=MeteredQueuePool,
+                               connect_args={"check_same_thread": False},
+                               **pool_options())
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        """applies sqlite_pragmas to a new connection"""
+        cursor = dbapi_connection.cursor()
+        for pragma in sqlite_pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+    return engine
 
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # AmenityBitmap - place_amenity as bitsets, None until first needed
+    __amenity_bits = None
+    # integer - the place_amenity counter of versions __amenity_bits was
+    # built at, rebuilt only once a save of any process moves it
+    __amenity_bits_version = None
+    # integer - values of related() sent in one IN query
+    related_batch = 500
+    # list - callables called with a class name when its objects change
+    __listeners = []
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -32,41 +155,170 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        HBNB_DB_URL = getenv('HBNB_DB_URL')
+        if HBNB_DB_URL and HBNB_DB_URL.startswith("sqlite:"):
+            self.__engine = sqlite_engine(HBNB_DB_URL)
+        elif HBNB_DB_URL:
+            self.__engine = create_engine(HBNB_DB_URL,
+                                          poolclass=MeteredQueuePool,
+                                          **pool_options())
+        else:
+            self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+                                          format(HBNB_MYSQL_USER,
+                                                 HBNB_MYSQL_PWD,
+                                                 HBNB_MYSQL_HOST,
+                                                 HBNB_MYSQL_DB),
+                                          poolclass=MeteredQueuePool,
+                                          **pool_options())
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, load=(), order_by=None):
+        """
+        query on the current database session; load lists relationship
+        paths of cls to fetch with the objects (see load_options) instead
+        of one query per object when they are first read, order_by the
+        attribute to sort them by in SQL, then by id
+        """
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                if load:
+                    query = query.options(*load_options(classes[clss], load))
+                if order_by is not None:
+                    query = query.order_by(getattr(classes[clss], order_by),
+                                           classes[clss].id)
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
-     def get(self, cls, id):
-         """
-         On the curret database session get an object of the given class.
-         Args:
-             cls (str): Name of object type. If None, no queries.
-             id (str): ID of object to query. If None, no queries.
-         Return:
-              The object based on the class name and its ID.
-         """
-         CLASS = classes[cls.__name__]
-         if CLASS is None:
-             return None
-         for value in self.all(CLASS).values():
-             if value.id == id:
-                 return value
-         return None
+    def related(self, cls, attr, value, order_by=None):
+        """
+        Returns the objects of a class whose attribute equals a value, or
+        any of a set of values in one IN query per related_batch of them.
+        Args:
+            cls (str): Class or class name of the objects to return.
+            attr (str): Name of the foreign key attribute, e.g. state_id.
+            value (str): The id the foreign key must be equal to, or a
+                list, tuple or set of ids it may be equal to.
+            order_by (str): If given, the attribute to sort them by.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        CLASS = classes[cls]
+        column = getattr(CLASS, attr)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            values = sorted(value)
+            conditions = [column.in_(values[i:i + self.related_batch])
+                          for i in range(0, len(values),
+                                         self.related_batch)]
+        else:
+            conditions = [column == value]
+        found = {}
+        for condition in conditions:
+            query = self.__session.query(CLASS).filter(condition)
+            if order_by is not None:
+                query = query.order_by(getattr(CLASS, order_by), CLASS.id)
+            for obj in query:
+                found[cls + '.' + obj.id] = obj
+        if order_by is not None and len(conditions) > 1:
+            found = dict(sorted(found.items(), key=lambda item: (
+                sort_key(getattr(item[1], order_by)), item[1].id)))
+        return found
+
+    def page(self, cls, limit, after=None, attr=None, value=None):
+        """
+        Returns up to limit objects of a class ordered by (created_at, id),
+        starting after a keyset cursor.
+        Args:
+            cls (str): Class or class name of the objects to return.
+            limit (int): Maximum number of objects to return.
+            after (tuple): (created_at, id) of the last object of the
+                previous page, or None for the first page.
+            attr (str): If given, only objects whose attr equals value.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        CLASS = classes[cls]
+        query = self.__session.query(CLASS)
+        if attr is not None:
+            query = query.filter(getattr(CLASS, attr) == value)
+        if after is not None:
+            query = query.filter(or_(CLASS.created_at > after[0],
+                                     and_(CLASS.created_at == after[0],
+                                          CLASS.id > after[1])))
+        query = query.order_by(CLASS.created_at, CLASS.id)
+        return query.limit(limit).all()
+
+    def places_with_amenities(self, amenity_ids):
+        """returns the set of ids of the places having every amenity"""
+        from models.place import place_amenity
+        query = select(versions.c.counter).where(
+            versions.c.name == "place_amenity")
+        version = self.__session.execute(query).scalar()
+        if self.__amenity_bits is None or \
+                version != self.__amenity_bits_version:
+            bitmap = AmenityBitmap()
+            query = select(place_amenity.c.amenity_id,
+                           place_amenity.c.place_id)
+            for amenity_id, place_id in self.__session.execute(query):
+                bitmap.add(amenity_id, place_id)
+            self.__amenity_bits = bitmap
+            self.__amenity_bits_version = version
+        return self.__amenity_bits.all_of(amenity_ids)
+
+    def places_in_ranges(self, ranges):
+        """
+        Returns the set of ids of the places whose numeric attributes are
+        within ranges, {attribute: (low, high)} with None for no bound.
+        """
+        query = self.__session.query(Place.id)
+        for name, (low, high) in ranges.items():
+            column = getattr(Place, name)
+            query = query.filter(column.isnot(None))
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+        return {id for id, in query}
+
+    def stream(self, cls=None, batch_size=1000, attr=None, value=None):
+        """
+        Yields the objects of the given class, or of every class, fetching
+        them from the database batch_size rows at a time; only those whose
+        attr equals value if attr is given.
+        """
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls is clss:
+                query = self.__session.query(classes[clss])
+                if attr is not None:
+                    query = query.filter(
+                        getattr(classes[clss], attr) == value)
+                for obj in query.yield_per(batch_size):
+                    yield obj
+
+    def get(self, cls, id, load=()):
+        """
+        On the curret database session get an object of the given class.
+        Args:
+            cls (str): Name of object type. If None, no queries.
+            id (str): ID of object to query. If None, no queries.
+            load (tuple): Relationship paths to load with the object.
+        Return:
+             The object based on the class name and its ID.
+        """
+        if cls is None or id is None:
+            return None
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        CLASS = classes.get(cls)
+        if CLASS is None:
+            return None
+        return self.__session.get(CLASS, id,
+                                  options=load_options(CLASS, load))
 
     def new(self, obj):
         """add the object to the current database session"""
@@ -74,7 +326,57 @@ class DBStorage:
 
     def save(self):
         """commit all changes of the current database session"""
-        self.__session.commit()
+        session = self.__session
+        session.flush()
+        bumped = session.info.pop("changed", set())
+        if bumped:
+            session.execute(versions.update()
+                            .where(versions.c.name.in_(sorted(bumped)))
+                            .values(counter=versions.c.counter + 1))
+        session.commit()
+        for name in bumped & set(classes):
+            for callback in self.__listeners:
+                callback(name)
+
+    def __collect(self, session, flush_context, instances):
+        """
+        before_flush listener: records in session.info the names the flush
+        changes, whether save or the autoflush of a query runs it
+        """
+        session.info.setdefault("changed", set()).update(
+            self.__changes(session))
+
+    @staticmethod
+    def __changes(session):
+        """
+        returns the names of version_names the pending changes of session
+        touch: the classes of its new, dirty and deleted objects, and
+        place_amenity if a place or amenity is deleted or one of their
+        relationships through place_amenity changed
+        """
+        from models.place import place_amenity
+        names = {obj.__class__.__name__ for objs in
+                 (session.new, session.dirty, session.deleted)
+                 for obj in objs}
+        if "Place" not in names and "Amenity" not in names:
+            return names
+        if any(isinstance(obj, (Place, Amenity)) for obj in session.deleted):
+            names.add("place_amenity")
+            return names
+        for obj in list(session.new) + list(session.dirty):
+            if not isinstance(obj, (Place, Amenity)):
+                continue
+            for relation in sqlalchemy.inspect(type(obj)).relationships:
+                if relation.secondary is place_amenity and get_history(
+                        obj, relation.key,
+                        PASSIVE_NO_INITIALIZE).has_changes():
+                    names.add("place_amenity")
+                    return names
+        return names
+
+    def subscribe(self, callback):
+        """calls callback(class name) once changes to its objects are saved"""
+        self.__listeners.append(callback)
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
@@ -82,15 +384,65 @@ class DBStorage:
             self.__session.delete(obj)
 
     def reload(self):
-        """reloads data from the database"""
+        """
+        reloads data from the database, first creating the indexes missing
+        from an existing one if HBNB_DB_MIGRATE is 1
+        """
         Base.metadata.create_all(self.__engine)
+        if getenv('HBNB_DB_MIGRATE') == "1":
+            self.migrate()
+        self.__seed_versions()
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "before_flush", self.__collect)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def __seed_versions(self):
+        """
+        inserts the counters of version_names missing from versions,
+        starting at the current time in microseconds so that a database
+        created again does not reuse the versions of the previous one
+        """
+        start = int(time.time() * 1000000)
+        try:
+            with self.__engine.begin() as connection:
+                present = {name for name, in
+                           connection.execute(select(versions.c.name))}
+                missing = [{"name": name, "counter": start}
+                           for name in version_names if name not in present]
+                if missing:
+                    connection.execute(versions.insert(), missing)
+        except sqlalchemy.exc.IntegrityError:
+            # another process inserted them first
+            pass
+
+    def migrate(self):
+        """
+        Creates the indexes declared by the models that an existing
+        database lacks, create_all only creating those of new tables, and
+        returns their names.
+        """
+        Base.metadata.create_all(self.__engine)
+        inspector = sqlalchemy.inspect(self.__engine)
+        created = []
+        for table in Base.metadata.sorted_tables:
+            existing = {index["name"]
+                        for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if index.name not in existing:
+                    index.create(self.__engine)
+                    created.append(index.name)
+        return created
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
+
+    def pool_stats(self):
+        """returns the connection pool usage counters, if it keeps any"""
+        pool = self.__engine.pool
+        return pool.stats() if hasattr(pool, "stats") else {}
+
     def count(self, cls=None):
         """
         Returns the number of objects in storage according to the given class
@@ -98,10 +450,37 @@ class DBStorage:
         Args:
             cls (str): The name of the class of None for all.
         """
-    if cls is None:
-        return len(self.all())
-    else:
-        CLASS = classes[cls.__name__]
+        if cls is None:
+            return sum(self.counts().values())
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        CLASS = classes.get(cls)
         if CLASS is None:
-            return len(self.all())
-    return len(self.all(CLASS))
+            return 0
+        return self.__session.query(func.count(CLASS.id)).scalar()
+
+    def version(self, cls=None):
+        """
+        Returns a string that changes whenever an object of the given class,
+        of any of a list of classes, or of any class, is added, updated or
+        removed: the counters save increments in versions, read in one query.
+        """
+        if cls is not None and not isinstance(cls, (list, tuple)):
+            cls = (cls,)
+        if cls is not None:
+            cls = {name if isinstance(name, str) else name.__name__
+                   for name in cls}
+        names = [name for name in classes if cls is None or name in cls]
+        if not names:
+            return ""
+        query = select(versions.c.name, versions.c.counter).where(
+            versions.c.name.in_(names))
+        counters = dict(self.__session.execute(query).all())
+        return "-".join(str(counters.get(name, 0)) for name in names)
+
+    def counts(self):
+        """returns the number of objects of every class, in one query"""
+        columns = [select(func.count(classes[clss].id)).scalar_subquery()
+                   for clss in classes]
+        row = self.__session.execute(select(*columns)).one()
+        return dict(zip(classes, row))
@@ -3,17 +3,142 @@
 Contains the FileStorage class
 """
 
+from contextlib import contextmanager
+import fcntl
+import heapq
 import json
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, to_dicts
+from models.engine.bitmap import AmenityBitmap
+from models.engine.columns import PlaceColumns
+from models.engine.ordering import SortedIndex, sort_key
 from models.city import City
+from models import compact
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from os import getenv
+import os
+import re
+import stat
+import tempfile
+import uuid
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+foreign_keys = {"Amenity": ("place_id",), "City": ("state_id",),
+                "Place": ("city_id", "user_id"),
+                "Review": ("place_id", "user_id")}
+# boolean - reload builds the __slots__ classes of models.compact
+compact_models = getenv("HBNB_FILE_COMPACT", "0") != "0"
+# compiled patterns - the whitespace JSON allows between tokens, a key
+# without escapes up to its value, the colon after a key and the
+# separator after a value
+whitespace = re.compile(r"[ \t\n\r]*")
+json_key = re.compile(r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:[ \t\n\r]*')
+json_colon = re.compile(r"[ \t\n\r]*:[ \t\n\r]*")
+json_separator = re.compile(r"[ \t\n\r]*([,}])")
+
+
+def iterload(f, chunk_size=65536):
+    """
+    Yields the key, value pairs of the JSON object in f one at a time,
+    reading the file in chunks instead of loading it whole. A pair cut by
+    the end of a chunk is parsed again once the next chunk is read.
+    """
+    # the scanner of the decoder, without the wrapping of raw_decode
+    scan = json.JSONDecoder().scan_once
+    buf = f.read(chunk_size)
+    pos = whitespace.match(buf).end()
+
+    def more():
+        """appends the next chunk of f to what is left of buf"""
+        nonlocal buf, pos
+        data = f.read(chunk_size)
+        if not data:
+            raise ValueError("truncated JSON object")
+        buf = buf[pos:] + data
+        pos = 0
+
+    while pos == len(buf):
+        more()
+    if buf[pos] != "{":
+        raise ValueError("expected a JSON object")
+    pos += 1
+    while True:
+        match = whitespace.match(buf, pos)
+        if match.end() < len(buf) and buf[match.end()] == "}":
+            return
+        if match.end() < len(buf):
+            break
+        more()
+    while True:
+        try:
+            match = json_key.match(buf, pos)
+            if match is not None:
+                key, end = match.group(1), match.end()
+            else:
+                # a key with escapes, or one cut by the end of buf
+                end = whitespace.match(buf, pos).end()
+                if end < len(buf) and buf[end] != '"':
+                    raise ValueError("expected a key at " +
+                                     buf[end:end + 20])
+                key, end = scan(buf, end)
+                match = json_colon.match(buf, end)
+                if match is None:
+                    if whitespace.match(buf, end).end() < len(buf):
+                        raise ValueError("expected ':' after " + key)
+                    more()
+                    continue
+                end = match.end()
+            value, end = scan(buf, end)
+        except (StopIteration, json.JSONDecodeError):
+            more()
+            continue
+        sep = json_separator.match(buf, end)
+        if sep is None:
+            if whitespace.match(buf, end).end() < len(buf):
+                raise ValueError("expected ',' after " + key)
+            more()
+            continue
+        pos = sep.end()
+        yield key, value
+        if sep.group(1) == "}":
+            return
+
+
+def iterdump(items, f, chunk_size=1000):
+    """
+    Writes the key, value pairs of items to f as one JSON object, the same
+    text as json.dump but encoding each value with the C encoder of
+    json.dumps, which json.dump does not use.
+    """
+    encode = json.dumps
+    chunk = ["{"]
+    sep = ""
+    for key, value in items:
+        chunk.append(sep + encode(key) + ": " + encode(value))
+        sep = ", "
+        if len(chunk) >= chunk_size:
+            f.write("".join(chunk))
+            chunk = []
+    chunk.append("}")
+    f.write("".join(chunk))
+
+
+def restore(value):
+    """
+    Builds the object described by a to_dict() dictionary without running
+    __init__; its timestamps stay strings until they are first read.
+    With compact_models, builds the compact class of the same name.
+    """
+    if compact_models:
+        return compact.classes[value.pop("__class__")].from_dict(value)
+    cls = classes[value.pop("__class__")]
+    obj = cls.__new__(cls)
+    object.__setattr__(obj, "__dict__", value)
+    return obj
 
 
 class FileStorage:
@@ -23,68 +148,578 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects partitioned by <class name>
+    __by_class = {}
+    # dictionary - <class name>, <foreign key> to {value: {key: obj}}
+    __refs = {}
+    # AmenityBitmap - amenity id to the bitset of its places
+    __amenity_bits = AmenityBitmap()
+    # PlaceColumns - numeric attributes of every place as columns
+    __place_columns = PlaceColumns()
+    # dictionary - <class name> to {(group_by, order_by): SortedIndex},
+    # the orders asked of all and related since __objects was indexed
+    __sorted = {}
+    # the __objects dictionary __by_class, __refs, __amenity_bits,
+    # __place_columns and __sorted were built from
+    __indexed = None
+    # string - "journal" appends each save to <__file_path>.journal
+    # instead of rewriting the whole file
+    __mode = getenv("HBNB_FILE_MODE", "snapshot")
+    # integer - journal records after which save() writes a new snapshot
+    __journal_max = int(getenv("HBNB_FILE_JOURNAL_MAX", "10000"))
+    # dictionary - keys changed since the last save, to obj or None
+    # if deleted; None when the whole store must be rewritten
+    __dirty = {}
+    # integer - records in the journal since the last snapshot
+    __journaled = 0
+    # tuple - (inode, mtime, size) of __file_path and (inode, offset) of
+    # its journal as last read or written by this process
+    __seen = (None, None)
+    # dictionary - <class name> to the number of times its objects were
+    # added, replaced or removed
+    __versions = {}
+    # string - changes whenever __versions starts over, so that a version
+    # is never reused by another process or another __objects
+    __epoch = uuid.uuid4().hex
+    # list - callables called with a class name when its objects change
+    __listeners = []
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
-        if cls is not None:
-            new_dict = {}
+    def __partition(self):
+        """returns __by_class, rebuilding it if __objects was replaced"""
+        if FileStorage.__indexed is not self.__objects:
+            if FileStorage.__indexed is not None:
+                FileStorage.__dirty = None
+            FileStorage.__by_class = {}
+            FileStorage.__refs = {}
+            FileStorage.__amenity_bits = AmenityBitmap()
+            FileStorage.__place_columns = PlaceColumns()
+            FileStorage.__sorted = {}
+            FileStorage.__indexed = self.__objects
+            FileStorage.__versions = {}
+            FileStorage.__epoch = uuid.uuid4().hex
+            for name in classes:
+                self.__notify(name)
             for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+                self.__link(key, value)
+        return FileStorage.__by_class
+
+    def __link(self, key, obj):
+        """
+        adds obj to the sorted views, then to the class partition and
+        foreign-key indexes; if a sorted view cannot take obj, the views
+        it was added to are undone and nothing else is changed
+        """
+        name = obj.__class__.__name__
+        views = FileStorage.__sorted.get(name)
+        if views:
+            added = []
+            try:
+                for index in views.values():
+                    index.add(key, obj)
+                    added.append(index)
+            except Exception:
+                for index in added:
+                    index.discard(key)
+                raise
+        objs = FileStorage.__by_class.get(name)
+        if objs is None:
+            objs = FileStorage.__by_class[name] = {}
+        objs[key] = obj
+        refs = FileStorage.__refs
+        for attr in foreign_keys.get(name, ()):
+            index = refs.get((name, attr))
+            if index is None:
+                index = refs[(name, attr)] = {}
+            bucket = index.get(getattr(obj, attr, None))
+            if bucket is None:
+                bucket = index[getattr(obj, attr, None)] = {}
+            bucket[key] = obj
+        if name == "Amenity" and getattr(obj, "place_id", None):
+            FileStorage.__amenity_bits.add(obj.id, obj.place_id)
+        elif name == "Place":
+            FileStorage.__place_columns.put(obj)
+
+    def __unlink(self, key, obj):
+        """removes obj from the class partition and foreign-key indexes"""
+        name = obj.__class__.__name__
+        FileStorage.__by_class.get(name, {}).pop(key, None)
+        for attr in foreign_keys.get(name, ()):
+            self.__unref(key, obj, attr, getattr(obj, attr, None))
+        if name == "Amenity" and getattr(obj, "place_id", None):
+            FileStorage.__amenity_bits.discard(obj.id, obj.place_id)
+        elif name == "Place":
+            FileStorage.__place_columns.discard(obj.id)
+        for index in FileStorage.__sorted.get(name, {}).values():
+            index.discard(key)
+
+    def __bump(self, obj):
+        """increments the version of the class of obj"""
+        name = obj.__class__.__name__
+        FileStorage.__versions[name] = FileStorage.__versions.get(name, 0) + 1
+        self.__notify(name)
+
+    def __notify(self, name):
+        """calls the listeners added by subscribe with a class name"""
+        for callback in FileStorage.__listeners:
+            callback(name)
+
+    def subscribe(self, callback):
+        """calls callback(class name) whenever objects of a class change"""
+        FileStorage.__listeners.append(callback)
+
+    def __unref(self, key, obj, attr, value):
+        """removes obj from the bucket of value in the attr index"""
+        index = FileStorage.__refs.get((obj.__class__.__name__, attr), {})
+        bucket = index.get(value, {})
+        if bucket.get(key) is obj:
+            del bucket[key]
+            if not bucket:
+                del index[value]
+
+    def all(self, cls=None, load=(), order_by=None):
+        """
+        returns the dictionary __objects, or a copy holding the objects of
+        cls; sorted by the order_by attribute of each class, then by id,
+        if it is given. load is accepted for parity with DBStorage,
+        relationships being index lookups here.
+        """
+        if cls is not None and not isinstance(cls, str):
+            cls = cls.__name__
+        if order_by is not None:
+            if cls is not None:
+                return dict(self.__ordered(cls, order_by).ordered())
+            ordered = {}
+            for name in classes:
+                ordered.update(self.__ordered(name, order_by).ordered())
+            return ordered
+        if cls is not None:
+            return dict(self.__partition().get(cls, {}))
         return self.__objects
 
-    def get(self, cls, id):
+    def __ordered(self, cls, order_by, group_by=None):
+        """
+        returns the SortedIndex of cls by order_by, split by group_by,
+        sorting the objects the first time it is asked for; __link and
+        __unlink keep it in order from then on
+        """
+        objects = self.__partition().get(cls, {})
+        indexes = FileStorage.__sorted.setdefault(cls, {})
+        index = indexes.get((group_by, order_by))
+        if index is None:
+            index = SortedIndex(order_by, group_by, objects)
+            indexes[(group_by, order_by)] = index
+        return index
+
+    def stream(self, cls=None, batch_size=None, attr=None, value=None):
+        """
+        Yields the objects of the given class, or of every class, one at a
+        time; only those whose attr equals value if attr is given.
+        batch_size is accepted for parity with DBStorage.
+        """
+        if cls is None:
+            objects = self.__objects
+        else:
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            objects = self.__bucket(cls, attr, value)
+        for obj in list(objects.values()):
+            yield obj
+
+    def get(self, cls, id, load=()):
         """
         On the curret database session get an object of the given class.
         Args:
             cls (str): Name of object type. If None, no queries.
             id (str): ID of object to query. If None, no queries.
+            load (tuple): Accepted for parity with DBStorage.
         Return:
              The object based on the class name and its ID.
         """
-        CLASS = classes[cls.__name__]
-        if CLASS is None:
+        if cls is None or id is None:
             return None
-        for value in self.all(CLASS).values():
-            if value.id == id:
-                return value
-        return None
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return self.__objects.get(cls + "." + id)
+
+    def __put(self, key, obj):
+        """stores obj under key in __objects and the indexes"""
+        self.__store(key, obj)
+        self.__bump(obj)
+
+    def __store(self, key, obj):
+        """stores obj under key without bumping the version of its class"""
+        self.__partition()
+        old = self.__objects.get(key)
+        if old is not None:
+            self.__unlink(key, old)
+        try:
+            self.__link(key, obj)
+        except Exception:
+            if old is not None:
+                if old is obj:
+                    # the sorted views cannot take obj back either, they
+                    # are dropped and sorted again when next asked for
+                    FileStorage.__sorted.pop(obj.__class__.__name__, None)
+                self.__link(key, old)
+            raise
+        self.__objects[key] = obj
+
+    def __remove(self, key):
+        """removes the object stored under key, if any"""
+        if key in self.__objects:
+            self.__partition()
+            self.__unlink(key, self.__objects[key])
+            self.__bump(self.__objects.pop(key))
+
+    def __mark(self, key, obj):
+        """records that key changed since the last save"""
+        if FileStorage.__dirty is not None:
+            FileStorage.__dirty[key] = obj
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            self.__put(key, obj)
+            self.__mark(key, obj)
+
+    def related(self, cls, attr, value, order_by=None):
+        """
+        Returns the objects of a class whose attribute equals a value, or
+        any of a set of values.
+        Args:
+            cls (str): Class or class name of the objects to return.
+            attr (str): Name of the foreign key attribute, e.g. state_id.
+            value (str): The id the foreign key must be equal to, or a
+                list, tuple or set of ids it may be equal to.
+            order_by (str): If given, the attribute to sort them by.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if isinstance(value, (list, tuple, set, frozenset)):
+            found = self.__any_of(cls, attr, set(value))
+            if order_by is not None:
+                found = dict(sorted(found.items(), key=lambda item: (
+                    sort_key(getattr(item[1], order_by, None)), item[0])))
+            return found
+        if order_by is not None:
+            return dict(self.__ordered(cls, order_by, attr).ordered(value))
+        return dict(self.__bucket(cls, attr, value))
+
+    def __any_of(self, cls, attr, values):
+        """returns the {key: obj} of cls whose attr is one of values"""
+        if attr == "id":
+            keys = (cls + "." + value for value in values)
+            return {key: self.__objects[key] for key in keys
+                    if key in self.__objects}
+        if attr in foreign_keys.get(cls, ()):
+            found = {}
+            for value in values:
+                found.update(self.__bucket(cls, attr, value))
+            return found
+        return {key: obj for key, obj in self.__bucket(cls).items()
+                if getattr(obj, attr, None) in values}
+
+    def __bucket(self, cls, attr=None, value=None):
+        """returns the live {key: obj} of cls, or those with attr == value"""
+        by_class = self.__partition()
+        if attr is None:
+            return by_class.get(cls, {})
+        if attr in foreign_keys.get(cls, ()):
+            return FileStorage.__refs.get((cls, attr), {}).get(value, {})
+        return {key: obj for key, obj in by_class.get(cls, {}).items()
+                if getattr(obj, attr, None) == value}
+
+    def page(self, cls, limit, after=None, attr=None, value=None):
+        """
+        Returns up to limit objects of a class ordered by (created_at, id),
+        starting after a keyset cursor.
+        Args:
+            cls (str): Class or class name of the objects to return.
+            limit (int): Maximum number of objects to return.
+            after (tuple): (created_at, id) of the last object of the
+                previous page, or None for the first page.
+            attr (str): If given, only objects whose attr equals value.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        objects = self.__bucket(cls, attr, value).values()
+        if after is not None:
+            objects = (obj for obj in objects
+                       if (obj.created_at, obj.id) > after)
+        return heapq.nsmallest(limit, objects,
+                               key=lambda obj: (obj.created_at, obj.id))
+
+    def places_with_amenities(self, amenity_ids):
+        """returns the set of ids of the places having every amenity"""
+        self.__partition()
+        return FileStorage.__amenity_bits.all_of(amenity_ids)
+
+    def places_in_ranges(self, ranges):
+        """
+        Returns the set of ids of the places whose numeric attributes are
+        within ranges, {attribute: (low, high)} with None for no bound.
+        The columns are updated by new, so attributes set since the last
+        new or save of a place are not seen.
+        """
+        self.__partition()
+        return FileStorage.__place_columns.select(ranges)
+
+    def version(self, cls=None):
+        """
+        Returns a string that changes whenever an object of the given class,
+        of any of a list of classes, or of any class, is added, saved or
+        removed.
+        """
+        self.__partition()
+        if cls is None:
+            count = sum(FileStorage.__versions.values())
+        else:
+            if not isinstance(cls, (list, tuple)):
+                cls = (cls,)
+            count = 0
+            for name in cls:
+                if not isinstance(name, str):
+                    name = name.__name__
+                count += FileStorage.__versions.get(name, 0)
+        return "{}-{:d}".format(FileStorage.__epoch, count)
+
+    def reindex(self, obj, attr, old):
+        """moves obj in the foreign-key index of attr, from old to now"""
+        name = obj.__class__.__name__
+        if attr not in foreign_keys.get(name, ()):
+            return
+        key = name + "." + obj.id
+        self.__partition()
+        if self.__objects.get(key) is not obj:
+            return
+        self.__unref(key, obj, attr, old)
+        index = FileStorage.__refs.setdefault((name, attr), {})
+        index.setdefault(getattr(obj, attr, None), {})[key] = obj
+        if name == "Amenity" and attr == "place_id":
+            if old:
+                FileStorage.__amenity_bits.discard(obj.id, old)
+            if getattr(obj, "place_id", None):
+                FileStorage.__amenity_bits.add(obj.id, obj.place_id)
+        for index in FileStorage.__sorted.get(name, {}).values():
+            index.add(key, obj)
+
+    @contextmanager
+    def __locked(self, shared=False):
+        """holds an advisory lock on <__file_path>.lock across processes"""
+        with open(self.__file_path + ".lock", 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def __replace(self, items):
+        """atomically replaces __file_path with the key, value pairs"""
+        folder = os.path.dirname(os.path.abspath(self.__file_path))
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=".file.json.")
+        try:
+            # mkstemp creates the file 0600, which os.replace would keep
+            os.fchmod(fd, self.__file_mode())
+            with os.fdopen(fd, 'w') as f:
+                iterdump(items, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.__file_path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        fd = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def __file_mode(self):
+        """
+        returns the permission bits of __file_path, or those open() would
+        give a new file under the current umask if it is missing
+        """
+        try:
+            return stat.S_IMODE(os.stat(self.__file_path).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
 
     def save(self):
         """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        dirty = FileStorage.__dirty
+        if self.__mode != "journal" or dirty is None or \
+                self.__journaled + len(dirty) > self.__journal_max:
+            self.compact()
+            return
+        if not dirty:
+            return
+        lines = []
+        for key, obj in dirty.items():
+            value = obj.to_dict() if obj is not None else None
+            lines.append(json.dumps({"key": key, "obj": value}) + "\n")
+        with self.__locked(), open(self.__file_path + ".journal", 'ab') as f:
+            before = os.fstat(f.fileno())
+            if before.st_size > 0:
+                with open(self.__file_path + ".journal", 'rb') as tail:
+                    tail.seek(-1, os.SEEK_END)
+                    if tail.read(1) != b"\n":
+                        lines.insert(0, "\n")
+            f.write("".join(lines).encode())
+            f.flush()
+            os.fsync(f.fileno())
+            seen = FileStorage.__seen[1] or (before.st_ino, 0)
+            if seen == (before.st_ino, before.st_size):
+                FileStorage.__seen = (FileStorage.__seen[0],
+                                      (before.st_ino, f.tell()))
+        FileStorage.__journaled += len(dirty)
+        FileStorage.__dirty = {}
+
+    def compact(self):
+        """
+        writes every object to __file_path and empties the journal; what
+        other processes saved since the last load is read first, under
+        the lock, and the changes of this process applied over it
+        """
+        self.__partition()
+        with self.__locked():
+            dirty = FileStorage.__dirty
+            if dirty is not None:
+                self.__refresh()
+                for key, obj in dirty.items():
+                    if obj is None:
+                        self.__remove(key)
+                    else:
+                        self.__put(key, obj)
+            items = zip(self.__objects, to_dicts(self.__objects.values()))
+            self.__replace(items)
+            if os.path.exists(self.__file_path + ".journal"):
+                os.remove(self.__file_path + ".journal")
+            FileStorage.__seen = (self.__stat(self.__file_path), None)
+        FileStorage.__journaled = 0
+        FileStorage.__dirty = {}
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the JSON file and replays its journal to __objects"""
+        try:
+            with self.__locked(shared=True):
+                self.__load()
+        except OSError:
+            self.__load()
+
+    def refresh(self):
+        """reloads only what other processes saved since the last load"""
+        try:
+            with self.__locked(shared=True):
+                self.__refresh()
+        except OSError:
+            self.__refresh()
+
+    def __refresh(self):
+        """compares __seen with the files and reads what changed"""
+        snapshot, journal = FileStorage.__seen
+        if snapshot is None or snapshot != self.__stat(self.__file_path):
+            self.__load()
+            return
+        now = self.__stat(self.__file_path + ".journal")
+        if now is None and journal is None:
+            return
+        if now is None or (journal is not None and now[0] != journal[0]) \
+                or (journal is not None and now[2] < journal[1]):
+            self.__load()
+            return
+        if journal is None or now[2] != journal[1]:
+            self.__replay(journal[1] if journal is not None else 0)
+
+    @staticmethod
+    def __stat(path):
+        """returns (inode, mtime, size) of path, or None if it is missing"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def __load(self):
+        """
+        reads __file_path, then the records of its journal, into a new
+        dictionary that replaces the content of __objects: objects other
+        processes deleted are dropped, the changes of this process not
+        saved yet are kept, and __partition rebuilds the indexes in one
+        pass when next needed
+        """
+        self.__partition()
+        dirty = FileStorage.__dirty
+        # a whole rewrite is pending: deletions cannot be told apart from
+        # objects never saved, so none of the current objects is dropped
+        objects = dict(self.__objects) if dirty is None else {}
+        snapshot = None
         try:
             with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
+                st = os.fstat(f.fileno())
+                snapshot = (st.st_ino, st.st_mtime_ns, st.st_size)
+                for key, value in iterload(f):
+                    objects[key] = restore(value)
+        except FileNotFoundError:
             pass
+        except Exception:
+            # an unreadable file drops nothing
+            objects = dict(self.__objects, **objects)
+        FileStorage.__seen = (snapshot, None)
+        FileStorage.__journaled = 0
+        self.__replay(0, objects)
+        for key, obj in (dirty or {}).items():
+            if obj is None:
+                objects.pop(key, None)
+            else:
+                objects[key] = obj
+        self.__objects.clear()
+        self.__objects.update(objects)
+        FileStorage.__indexed = None
+
+    def __replay(self, offset, objects=None):
+        """
+        applies the journal records found after offset, to the plain
+        dictionary objects if given, else to __objects and its indexes
+        """
+        try:
+            with open(self.__file_path + ".journal", 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    offset += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    key, value = record["key"], record["obj"]
+                    if objects is not None:
+                        if value is None:
+                            objects.pop(key, None)
+                        else:
+                            objects[key] = restore(value)
+                    elif value is None:
+                        self.__remove(key)
+                    else:
+                        self.__put(key, restore(value))
+                    FileStorage.__journaled += 1
+                FileStorage.__seen = (FileStorage.__seen[0],
+                                      (os.fstat(f.fileno()).st_ino, offset))
+        except FileNotFoundError:
+            FileStorage.__seen = (FileStorage.__seen[0], None)
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
             if key in self.__objects:
-                del self.__objects[key]
+                self.__remove(key)
+                self.__mark(key, None)
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call refresh() to pick up objects saved by other processes"""
+        self.refresh()
 
     def count(self, cls=None):
         """
@@ -93,10 +728,13 @@ class FileStorage:
         Args:
             cls (str): The name of the class of None for all.
         """
-    if cls is None:
-        return len(self.all())
-    else:
-        CLASS = classes[cls.__name__]
-        if CLASS is None:
-            return len(self.all())
-        return len(self.all(CLASS))
+        if cls is None:
+            return len(self.__objects)
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return len(self.__partition().get(cls, {}))
+
+    def counts(self):
+        """returns the number of objects of every class"""
+        by_class = self.__partition()
+        return {name: len(by_class.get(name, {})) for name in classes}
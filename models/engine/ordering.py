@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""
+Contains the SortedIndex class
+"""
+
+from bisect import bisect_left, insort
+from operator import itemgetter
+
+
+def sort_key(value):
+    """
+    returns the key sorting value, None first as in SQL, then numbers,
+    then other values grouped by type name so that mixed types never
+    have to be compared with each other
+    """
+    if value is None:
+        return (0, "", 0)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (1, "", value)
+    return (1, type(value).__name__, value)
+
+
+class SortedIndex:
+    """
+    Objects kept sorted by one attribute, then by key, in one list per
+    value of another attribute if group_by is given. Objects are inserted
+    and removed with bisect, so the order is never rebuilt after the
+    first sort, and the {key: obj} dictionary of a group is kept until
+    the group changes.
+    """
+
+    def __init__(self, order_by, group_by=None, objects=None):
+        """
+        Instantiate the index of the {key: obj} objects, sorted once
+        Args:
+            order_by (str): Name of the attribute the keys are sorted by.
+            group_by (str): Name of the attribute the lists are split by.
+        """
+        self.order_by = order_by
+        self.group_by = group_by
+        # dictionary - group value to its sorted list of (sort key, key,
+        # obj), the keys being unique so that obj is never compared
+        self.groups = {}
+        # dictionary - key to the (group value, entry) it is stored under
+        self.entries = {}
+        # dictionary - group value to its sorted {key: obj}, built on demand
+        self.__ordered = {}
+        for key, obj in (objects or {}).items():
+            group, entry = self.__entry(key, obj)
+            self.groups.setdefault(group, []).append(entry)
+            self.entries[key] = (group, entry)
+        for entries in self.groups.values():
+            entries.sort()
+
+    def __entry(self, key, obj):
+        """returns the group value and the sorted entry of obj"""
+        group = None
+        if self.group_by is not None:
+            group = getattr(obj, self.group_by, None)
+        return group, (sort_key(getattr(obj, self.order_by, None)), key, obj)
+
+    def add(self, key, obj):
+        """inserts or moves the key of obj to its place"""
+        self.discard(key)
+        group, entry = self.__entry(key, obj)
+        insort(self.groups.setdefault(group, []), entry)
+        self.__ordered.pop(group, None)
+        self.entries[key] = (group, entry)
+
+    def discard(self, key):
+        """removes a key"""
+        stored = self.entries.pop(key, None)
+        if stored is not None:
+            group, entry = stored
+            entries = self.groups[group]
+            del entries[bisect_left(entries, entry)]
+            self.__ordered.pop(group, None)
+            if not entries:
+                del self.groups[group]
+
+    def keys(self, group=None):
+        """returns the sorted keys, of a group if group_by is given"""
+        return [entry[1] for entry in self.groups.get(group, ())]
+
+    def ordered(self, group=None):
+        """
+        returns the sorted {key: obj} of a group, to be copied rather
+        than changed
+        """
+        ordered = self.__ordered.get(group)
+        if ordered is None:
+            ordered = dict(map(itemgetter(1, 2), self.groups.get(group, ())))
+            self.__ordered[group] = ordered
+        return ordered
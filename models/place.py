@@ -5,6 +5,7 @@ from models.base_model import BaseModel, Base
 from os import getenv
 import sqlalchemy
 from sqlalchemy import Column, String, Integer, Float, ForeignKey, Table
+from sqlalchemy import Index
 from sqlalchemy.orm import relationship
 
 if models.storage_t == 'db':
@@ -23,14 +24,19 @@ class Place(BaseModel, Base):
     """Representation of Place """
     if models.storage_t == 'db':
         __tablename__ = 'places'
+        # places of a city, in the (created_at, id) order of page()
+        __table_args__ = (Index('ix_places_city_id_created_at',
+                                'city_id', 'created_at', 'id'),)
         city_id = Column(String(60), ForeignKey('cities.id'), nullable=False)
-        user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
-        name = Column(String(128), nullable=False)
+        user_id = Column(String(60), ForeignKey('users.id'), nullable=False,
+                         index=True)
+        name = Column(String(128), nullable=False, index=True)
         description = Column(String(1024), nullable=True)
         number_rooms = Column(Integer, nullable=False, default=0)
         number_bathrooms = Column(Integer, nullable=False, default=0)
         max_guest = Column(Integer, nullable=False, default=0)
-        price_by_night = Column(Integer, nullable=False, default=0)
+        price_by_night = Column(Integer, nullable=False, default=0,
+                                index=True)
         latitude = Column(Float, nullable=True)
         longitude = Column(Float, nullable=True)
         reviews = relationship("Review", backref="place")
@@ -59,20 +65,18 @@ class Place(BaseModel, Base):
         def reviews(self):
             """getter attribute returns the list of Review instances"""
             from models.review import Review
-            review_list = []
-            all_reviews = models.storage.all(Review)
-            for review in all_reviews.values():
-                if review.place_id == self.id:
-                    review_list.append(review)
-            return review_list
+            return list(models.storage.related(Review, "place_id",
+                                               self.id).values())
+
+        @property
+        def user(self):
+            """getter attribute returns the User owning the place"""
+            from models.user import User
+            return models.storage.get(User, self.user_id)
 
         @property
         def amenities(self):
             """getter attribute returns the list of Amenity instances"""
             from models.amenity import Amenity
-            amenity_list = []
-            all_amenities = models.storage.all(Amenity)
-            for amenity in all_amenities.values():
-                if amenity.place_id == self.id:
-                    amenity_list.append(amenity)
-            return amenity_list
+            return list(models.storage.related(Amenity, "place_id",
+                                               self.id).values())
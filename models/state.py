@@ -13,8 +13,9 @@ class State(BaseModel, Base):
     """Representation of state """
     if models.storage_t == "db":
         __tablename__ = 'states'
-        name = Column(String(128), nullable=False)
-        cities = relationship("City", backref="state")
+        name = Column(String(128), nullable=False, index=True)
+        cities = relationship("City", backref="state",
+                              order_by="(City.name, City.id)")
     else:
         name = ""
 
@@ -25,10 +26,7 @@ class State(BaseModel, Base):
     if models.storage_t != "db":
         @property
         def cities(self):
-            """getter for list of city instances related to the state"""
-            city_list = []
-            all_cities = models.storage.all(City)
-            for city in all_cities.values():
-                if city.state_id == self.id:
-                    city_list.append(city)
-            return city_list
+            """getter for list of city instances related to the state, by
+            name like the relationship of DB storage"""
+            return list(models.storage.related(City, "state_id", self.id,
+                                               order_by="name").values())
@@ -0,0 +1,205 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs, TestLocalCache and TestResponseCache classes
+"""
+
+from api.v1.app import app
+from api.v1.views import cache
+from api.v1.views.cache import LocalCache, response_cache
+import models
+from models.state import State
+import pep8
+import time
+import unittest
+import unittest.mock
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of cache"""
+    def test_pep8_conformance_cache(self):
+        """Test that cache.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/cache.py',
+                                    'tests/test_api/test_v1/test_views/\
+test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_docstrings(self):
+        """Test for the presence of docstrings in cache"""
+        for func in (cache, cache.LocalCache, cache.ResponseCache,
+                     cache.cached, cache.store, cache.buffered,
+                     LocalCache.get, LocalCache.set,
+                     LocalCache.evict, cache.ResponseCache.invalidate,
+                     cache.ResponseCache.key, cache.ResponseCache.stats):
+            self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestLocalCache(unittest.TestCase):
+    """Test the LRU, byte bound, TTL and tags of LocalCache"""
+    def test_lru(self):
+        """Test that the least recently used entries go past max_bytes"""
+        local = LocalCache(max_bytes=10)
+        local.set("a", 1, 4)
+        local.set("b", 2, 4)
+        self.assertEqual(local.get("a"), 1)
+        local.set("c", 3, 4)
+        self.assertIsNone(local.get("b"))
+        self.assertEqual(local.get("a"), 1)
+        self.assertEqual(len(local), 2)
+        self.assertEqual(local.nbytes, 8)
+        local.set("a", 4, 2)
+        self.assertEqual(local.nbytes, 6)
+
+    def test_too_large(self):
+        """Test that a value larger than max_bytes is not stored"""
+        local = LocalCache(max_bytes=10)
+        local.set("a", 1, 4)
+        local.set("b", 2, 11)
+        self.assertIsNone(local.get("b"))
+        self.assertEqual(local.get("a"), 1)
+
+    def test_ttl(self):
+        """Test that entries expire after ttl seconds"""
+        local = LocalCache(ttl=0.01)
+        local.set("a", 1, 1)
+        time.sleep(0.02)
+        self.assertIsNone(local.get("a"))
+        self.assertEqual(local.nbytes, 0)
+
+    def test_evict(self):
+        """Test that evict drops the entries of a tag and only those"""
+        local = LocalCache()
+        local.set("a", 1, 1, ("State",))
+        local.set("b", 2, 1, ("State", "City"))
+        local.set("c", 3, 1, ("City",))
+        local.evict("State")
+        self.assertIsNone(local.get("a"))
+        self.assertIsNone(local.get("b"))
+        self.assertEqual(local.get("c"), 3)
+        local.evict("City")
+        local.evict("Place")
+        self.assertEqual((len(local), local.nbytes), (0, 0))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test that read routes are cached and invalidated by writes"""
+    @classmethod
+    def setUpClass(cls):
+        """Create a state"""
+        cls.client = app.test_client()
+        cls.state = State(name="Oregon")
+        models.storage.new(cls.state)
+        models.storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the states created by the tests"""
+        for state in models.storage.all(State).values():
+            if state.name in ("Oregon", "Utah"):
+                models.storage.delete(state)
+        models.storage.save()
+
+    def test_hit_after_miss(self):
+        """Test that the second identical GET is a hit"""
+        url = "/api/v1/states/" + self.state.id
+        hits = response_cache.hits
+        first = self.client.get(url)
+        second = self.client.get(url)
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(second.get_json(), first.get_json())
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+        self.assertGreater(response_cache.hits, hits)
+        response = self.client.get(url, headers={"If-None-Match":
+                                                 first.headers["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_invalidates(self):
+        """Test that storage writes are never served stale"""
+        self.client.get("/api/v1/states")
+        self.client.get("/api/v1/stats")
+        state = State(name="Utah")
+        models.storage.new(state)
+        models.storage.save()
+        response = self.client.get("/api/v1/states")
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+        self.assertIn(state.id, [s["id"] for s in response.get_json()])
+        response = self.client.get("/api/v1/stats")
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+        self.client.put("/api/v1/states/" + state.id, json={"name": "Utah"})
+        self.client.delete("/api/v1/states/" + state.id)
+        response = self.client.get("/api/v1/states/" + state.id)
+        self.assertEqual(response.status_code, 404)
+
+    def test_write_elsewhere_invalidates(self):
+        """Test that a write this process is not told about, as made by
+        another worker, is not served stale either"""
+        url = "/api/v1/states/" + self.state.id
+        self.client.get(url)
+        self.assertEqual(self.client.get(url).headers["X-Cache"], "HIT")
+        with unittest.mock.patch.object(response_cache.backend, "evict"):
+            self.state.name = "Utah"
+            models.storage.new(self.state)
+            models.storage.save()
+        try:
+            response = self.client.get(url)
+            self.assertEqual(response.headers["X-Cache"], "MISS")
+            self.assertEqual(response.get_json()["name"], "Utah")
+        finally:
+            self.state.name = "Oregon"
+            models.storage.new(self.state)
+            models.storage.save()
+
+    def test_key_is_normalized(self):
+        """Test that unread query arguments and equivalent Accept headers
+        share one entry"""
+        url = "/api/v1/states/" + self.state.id
+        self.client.get(url)
+        for query, accept in (("?utm=1", "*/*"), ("?b=2&a=1", "application/*"),
+                              ("", "application/json")):
+            response = self.client.get(url + query,
+                                       headers={"Accept": accept})
+            self.assertEqual(response.headers["X-Cache"], "HIT")
+        response = self.client.get("/api/v1/states?limit=1")
+        self.assertEqual(self.client.get("/api/v1/states?limit=1&x=y")
+                         .headers["X-Cache"], "HIT")
+        self.assertEqual(self.client.get("/api/v1/states?limit=2")
+                         .headers["X-Cache"], "MISS")
+
+    def test_streamed_list_cached(self):
+        """Test that a streamed list is stored once sent, then is a hit"""
+        first = self.client.get("/api/v1/states")
+        self.assertTrue(first.is_streamed)
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        body = first.get_data()
+        second = self.client.get("/api/v1/states")
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(second.get_data(), body)
+        self.assertEqual(second.mimetype, first.mimetype)
+
+    def test_streamed_too_large_not_cached(self):
+        """Test that a streamed list larger than the cache is not kept"""
+        with unittest.mock.patch.object(response_cache.backend,
+                                        "max_bytes", 8):
+            for i in range(2):
+                response = self.client.get("/api/v1/amenities")
+                self.assertIn(b"[", response.get_data())
+                self.assertEqual(response.headers["X-Cache"], "MISS")
+
+    def test_streamed_cut_short_not_cached(self):
+        """Test that a streamed list the client stops reading is not
+        kept"""
+        nbytes = response_cache.backend.nbytes
+        response = self.client.get("/api/v1/states?x=cut")
+        response.close()
+        self.assertEqual(response_cache.backend.nbytes, nbytes)
+
+    def test_stats(self):
+        """Test that /stats/cache reports the counters"""
+        self.client.get("/api/v1/amenities")
+        self.client.get("/api/v1/amenities")
+        stats = self.client.get("/api/v1/stats/cache").get_json()
+        for key in ("hits", "misses", "invalidations", "hit_ratio",
+                    "entries", "bytes"):
+            self.assertIn(key, stats)
+        self.assertGreaterEqual(stats["hits"], 1)
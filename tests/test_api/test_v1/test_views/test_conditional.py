@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+"""
+Contains the TestConditionalDocs and TestConditional classes
+"""
+
+from api.v1.app import app
+from api.v1.views import conditional
+import models
+from models.state import State
+import pep8
+import unittest
+
+
+class TestConditionalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of conditional"""
+    def test_pep8_conformance_conditional(self):
+        """Test that conditional.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/conditional.py',
+                                    'tests/test_api/test_v1/test_views/\
+test_conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_conditional_docstrings(self):
+        """Test for the presence of docstrings in conditional"""
+        for func in (conditional, conditional.variant, conditional.etag,
+                     conditional.etag_of, conditional.not_modified,
+                     conditional.add_etag):
+            self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestConditional(unittest.TestCase):
+    """Test ETag and If-None-Match on the read routes"""
+    @classmethod
+    def setUpClass(cls):
+        """Create a state"""
+        cls.client = app.test_client()
+        cls.state = State(name="California")
+        models.storage.new(cls.state)
+        models.storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the states created by the tests"""
+        for state in models.storage.all(State).values():
+            if state.name in ("California", "Nevada"):
+                models.storage.delete(state)
+        models.storage.save()
+
+    def revalidate(self, url, **headers):
+        """returns the first response for url and a conditional GET"""
+        first = self.client.get(url, headers=headers)
+        tag = first.headers["ETag"]
+        headers["If-None-Match"] = tag
+        return first, self.client.get(url, headers=headers)
+
+    def test_not_modified(self):
+        """Test that a matching If-None-Match gets an empty 304"""
+        for url in ("/api/v1/status", "/api/v1/stats", "/api/v1/states",
+                    "/api/v1/states/" + self.state.id):
+            first, second = self.revalidate(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(second.status_code, 304)
+            self.assertEqual(second.data, b"")
+            self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+            self.assertIn("no-cache", first.headers["Cache-Control"])
+
+    def test_changed_after_write(self):
+        """Test that creating or updating a state changes the ETags"""
+        before = self.client.get("/api/v1/states").headers["ETag"]
+        one = self.client.get("/api/v1/states/" + self.state.id)
+        response = self.client.post("/api/v1/states",
+                                    json={"name": "Nevada"})
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("ETag", response.headers)
+        response = self.client.get("/api/v1/states",
+                                   headers={"If-None-Match": before})
+        self.assertEqual(response.status_code, 200)
+        self.client.put("/api/v1/states/" + self.state.id,
+                        json={"name": "California"})
+        response = self.client.get("/api/v1/states/" + self.state.id,
+                                   headers={"If-None-Match":
+                                            one.headers["ETag"]})
+        self.assertEqual(response.status_code, 200)
+
+    def test_changed_within_same_timestamp(self):
+        """Test that a change keeping updated_at still changes the ETag"""
+        state = State(name="Nevada")
+        models.storage.new(state)
+        models.storage.save()
+        url = "/api/v1/states/" + state.id
+        first = self.client.get(url)
+        state.name = "California"
+        models.storage.new(state)
+        models.storage.save()
+        response = self.client.get(url, headers={"If-None-Match":
+                                                 first.headers["ETag"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "California")
+        self.assertEqual(response.get_json()["updated_at"],
+                         first.get_json()["updated_at"])
+
+    def test_per_representation(self):
+        """Test that JSON and NDJSON listings get different ETags"""
+        json_tag = self.client.get("/api/v1/states").headers["ETag"]
+        response = self.client.get(
+            "/api/v1/states", headers={"Accept": "application/x-ndjson",
+                                       "If-None-Match": json_tag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Accept", response.headers["Vary"])
+
+    def test_private_users(self):
+        """Test that user responses are not marked public"""
+        response = self.client.get("/api/v1/users")
+        self.assertIn("private", response.headers["Cache-Control"])
+
+    def test_missing_object(self):
+        """Test that a 404 carries no ETag"""
+        response = self.client.get("/api/v1/states/not-an-id")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response.headers)
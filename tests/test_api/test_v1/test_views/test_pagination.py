@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs and TestPagination classes
+"""
+
+from api.v1.app import app
+from api.v1.views import pagination
+import base64
+from datetime import datetime, timedelta
+import models
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pagination"""
+    def test_pep8_conformance_pagination(self):
+        """Test that pagination.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/pagination.py',
+                                    'tests/test_api/test_v1/test_views/\
+test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_docstrings(self):
+        """Test for the presence of docstrings in pagination"""
+        for func in (pagination, pagination.encode_cursor,
+                     pagination.decode_cursor, pagination.paginated):
+            self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestPagination(unittest.TestCase):
+    """Test limit and cursor on the list routes"""
+    @classmethod
+    def setUpClass(cls):
+        """Create 5 states, and a place with 3 reviews"""
+        cls.client = app.test_client()
+        start = datetime(2017, 3, 25, 2, 17, 6)
+        cls.states = [State(name="State {:d}".format(i),
+                            created_at=(start + timedelta(seconds=i // 2))
+                            .isoformat(timespec="microseconds"))
+                      for i in range(5)]
+        cls.user = User(email="a@b.c", password="pwd")
+        cls.place = Place(name="Loft", user_id=cls.user.id)
+        cls.reviews = [Review(text=str(i), place_id=cls.place.id,
+                              user_id=cls.user.id) for i in range(3)]
+        cls.objs = list(cls.states)
+        if models.storage_t != 'db':
+            cls.objs += [cls.user, cls.place] + cls.reviews
+        for obj in cls.objs:
+            models.storage.new(obj)
+        models.storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the objects created by setUpClass"""
+        for obj in cls.objs:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def walk(self, url, limit):
+        """Follow the next links from url and return all the ids"""
+        ids = []
+        response = self.client.get("{}?limit={:d}".format(url, limit))
+        while True:
+            self.assertEqual(response.status_code, 200)
+            page = response.get_json()
+            self.assertLessEqual(len(page), limit)
+            ids.extend(obj["id"] for obj in page)
+            if "Link" not in response.headers:
+                self.assertNotIn("X-Next-Cursor", response.headers)
+                return ids
+            link = response.headers["Link"]
+            self.assertTrue(link.endswith('>; rel="next"'))
+            self.assertIn(response.headers["X-Next-Cursor"], link)
+            response = self.client.get(link[1:link.index(">")])
+
+    def test_states_pages_in_keyset_order(self):
+        """Test that paging through /states returns every state once"""
+        mine = {state.id for state in self.states}
+        for limit in (1, 2, 1000):
+            with self.subTest(limit=limit):
+                ids = self.walk("/api/v1/states", limit)
+                self.assertEqual(len(ids), len(set(ids)))
+                expected = sorted(self.states,
+                                  key=lambda s: (s.created_at, s.id))
+                self.assertEqual([i for i in ids if i in mine],
+                                 [state.id for state in expected])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reviews_of_place(self):
+        """Test that paging through a place's reviews returns all of them"""
+        ids = self.walk("/api/v1/places/{}/reviews".format(self.place.id),
+                        2)
+        self.assertCountEqual(ids, [review.id for review in self.reviews])
+
+    def test_no_limit_lists_everything(self):
+        """Test that the routes still return everything without limit"""
+        response = self.client.get("/api/v1/states")
+        self.assertNotIn("Link", response.headers)
+        ids = {state["id"] for state in response.get_json()}
+        self.assertTrue({state.id for state in self.states} <= ids)
+
+    def test_invalid_arguments(self):
+        """Test that bad limits and cursors are rejected"""
+        aware = base64.urlsafe_b64encode(
+            b"2017-03-25T02:17:06+00:00 abc").decode()
+        for query in ("limit=0", "limit=abc", "limit=1001", "cursor=%%%",
+                      "cursor=bm90IGEgY3Vyc29y", "cursor=" + aware):
+            with self.subTest(query=query):
+                response = self.client.get("/api/v1/states?" + query)
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,236 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesViewDocs, TestPlacesSearch and
+TestPlacesSearchBenchmark classes
+"""
+
+from api.v1.app import app
+from api.v1.views import places
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import pep8
+import sqlalchemy
+import timeit
+import unittest
+
+
+def link(place, amenity):
+    """Give place the amenity, the way the storage engine in use does"""
+    if models.storage_t == 'db':
+        place.amenities.append(amenity)
+    else:
+        amenity.place_id = place.id
+
+
+class TestPlacesViewDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the places view"""
+    def test_pep8_conformance_places(self):
+        """Test that api/v1/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_places(self):
+        """Test tests/test_api/test_v1/test_views/test_places.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_search_places_docstring(self):
+        """Test for the search_places docstring"""
+        self.assertTrue(len(places.search_places.__doc__) >= 1)
+
+
+class TestPlacesSearch(unittest.TestCase):
+    """Test the POST /api/v1/places_search route"""
+    @classmethod
+    def setUpClass(cls):
+        """Create two states with one city and place each, and amenities"""
+        cls.client = app.test_client()
+        cls.user = User(email="a@b.c", password="pwd")
+        cls.states = [State(name="California"), State(name="Nevada")]
+        cls.cities = [City(name="San Francisco", state_id=cls.states[0].id),
+                      City(name="Reno", state_id=cls.states[1].id)]
+        cls.places = [Place(name="Loft", city_id=cls.cities[0].id,
+                            user_id=cls.user.id, max_guest=2,
+                            price_by_night=120),
+                      Place(name="Cabin", city_id=cls.cities[1].id,
+                            user_id=cls.user.id, max_guest=6,
+                            price_by_night=80)]
+        cls.wifi = Amenity(name="Wifi")
+        cls.pool = Amenity(name="Pool")
+        for obj in [cls.user, cls.wifi, cls.pool] + cls.states + \
+                cls.cities + cls.places:
+            models.storage.new(obj)
+        models.storage.save()
+        link(cls.places[0], cls.wifi)
+        link(cls.places[1], cls.pool)
+        models.storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the objects created by setUpClass"""
+        for obj in cls.places + cls.cities + cls.states + \
+                [cls.wifi, cls.pool, cls.user]:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def search(self, body):
+        """POST body to places_search and return the names found"""
+        response = self.client.post('/api/v1/places_search', json=body)
+        self.assertEqual(response.status_code, 200)
+        ids = {place.id for place in self.places}
+        return sorted(place["name"] for place in response.get_json()
+                      if place["id"] in ids)
+
+    def test_not_a_json(self):
+        """Test that a body that is not a JSON object is rejected"""
+        response = self.client.post('/api/v1/places_search', data="states",
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"error": "Not a JSON"})
+
+    def test_empty_body_returns_everything(self):
+        """Test that no filter returns every place"""
+        self.assertEqual(self.search({}), ["Cabin", "Loft"])
+        self.assertEqual(self.search({"states": [], "cities": []}),
+                         ["Cabin", "Loft"])
+
+    def test_states_and_cities(self):
+        """Test that states and cities add up"""
+        self.assertEqual(self.search({"states": [self.states[0].id]}),
+                         ["Loft"])
+        self.assertEqual(self.search({"states": [self.states[0].id],
+                                      "cities": [self.cities[1].id]}),
+                         ["Cabin", "Loft"])
+
+    def test_amenities_must_all_match(self):
+        """Test that a place must have every amenity asked for"""
+        self.assertEqual(self.search({"amenities": [self.wifi.id]}),
+                         ["Loft"])
+        self.assertEqual(self.search({"amenities": [self.wifi.id,
+                                                    self.pool.id]}), [])
+        self.assertEqual(self.search({"cities": [self.cities[1].id],
+                                      "amenities": [self.pool.id]}),
+                         ["Cabin"])
+
+    def test_ranges(self):
+        """Test that ranges filter on numeric attributes"""
+        self.assertEqual(self.search({"ranges": {"max_guest": [4, None]}}),
+                         ["Cabin"])
+        self.assertEqual(self.search({"ranges": {"max_guest": 2}}),
+                         ["Loft"])
+        self.assertEqual(self.search({"ranges": {
+            "price_by_night": {"min": 50, "max": 150}}}), ["Cabin", "Loft"])
+        self.assertEqual(self.search({"amenities": [self.wifi.id],
+                                      "ranges": {"max_guest": [4, 8]}}),
+                         [])
+
+    def test_invalid_ranges(self):
+        """Test that unknown attributes and bad bounds are rejected"""
+        for ranges in ({"name": 1}, {"max_guest": "many"}, ["max_guest"]):
+            response = self.client.post('/api/v1/places_search',
+                                        json={"ranges": ranges})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json(),
+                             {"error": "Invalid ranges"})
+
+    def test_invalid_filters(self):
+        """Test that states, cities and amenities must be lists of ids"""
+        for name in ("states", "cities", "amenities"):
+            for value in (5, "abc", {"id": "x"}, [["x"]], [{"id": 1}], [1]):
+                response = self.client.post('/api/v1/places_search',
+                                            json={name: value})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.get_json(),
+                                 {"error": "Invalid " + name})
+        self.assertEqual(self.search({"states": None, "cities": None,
+                                      "amenities": None}),
+                         ["Cabin", "Loft"])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_query_count_is_bounded(self):
+        """Test that states and cities are looked up in one query each,
+        not one per state and per city"""
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, many):
+            """records every statement sent to the database"""
+            statements.append(statement)
+        body = {"states": [state.id for state in self.states] +
+                ["unknown-{:d}".format(i) for i in range(20)],
+                "cities": ["unknown-{:d}".format(i) for i in range(20)]}
+        models.storage.close()
+        sqlalchemy.event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = self.client.post('/api/v1/places_search', json=body)
+            names = sorted(place["name"] for place in response.get_json())
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", count)
+        self.assertIn("Cabin", names)
+        self.assertIn("Loft", names)
+        self.assertLessEqual(len(statements), 3)
+
+
+@unittest.skipUnless(os.getenv("HBNB_BENCHMARKS", "0") != "0",
+                     "not running benchmarks")
+class TestPlacesSearchBenchmark(unittest.TestCase):
+    """Benchmark places_search on 100k places and 50 amenities"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_beats_nested_loops(self):
+        """Test that the indexed search beats scanning every object"""
+        saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            states = [State(name="State {:d}".format(i)) for i in range(50)]
+            cities = [City(name="City {:d}".format(i),
+                           state_id=states[i % 50].id) for i in range(1000)]
+            amenities = [Amenity(name="Amenity {:d}".format(i))
+                         for i in range(50)]
+            for obj in states + cities + amenities:
+                models.storage.new(obj)
+            for i in range(100000):
+                place = Place(name="Place", city_id=cities[i % 1000].id)
+                models.storage.new(place)
+                if i < 50:
+                    amenities[i].place_id = place.id
+            state_ids = [states[0].id]
+            amenity_ids = [amenity.id for amenity in amenities[:1]]
+
+            def nested_loops():
+                """Search the way a direct implementation would"""
+                found = []
+                for state_id in state_ids:
+                    for city in models.storage.all(City).values():
+                        if city.state_id != state_id:
+                            continue
+                        for place in models.storage.all(Place).values():
+                            if place.city_id != city.id:
+                                continue
+                            ids = {a.id for a in place.amenities}
+                            if all(i in ids for i in amenity_ids):
+                                found.append(place.id)
+                return found
+
+            client = app.test_client()
+            body = {"states": state_ids, "amenities": amenity_ids}
+            response = client.post('/api/v1/places_search', json=body)
+            self.assertEqual([place["id"] for place in response.get_json()],
+                             nested_loops())
+            indexed = min(timeit.repeat(
+                lambda: client.post('/api/v1/places_search', json=body),
+                number=1, repeat=3))
+            naive = min(timeit.repeat(nested_loops, number=1, repeat=1))
+        finally:
+            FileStorage._FileStorage__objects = saved
+        self.assertLess(indexed * 10, naive)
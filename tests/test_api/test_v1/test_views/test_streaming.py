@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+Contains the TestStreamingDocs and TestStreaming classes
+"""
+
+from api.v1.app import app
+from api.v1.views import cache, streaming
+import json
+import models
+from models.base_model import BaseModel
+from models.state import State
+import os
+import pep8
+import timeit
+import unittest
+from unittest import mock
+
+
+def legacy_to_dict(self):
+    """BaseModel.to_dict as it was before it cached its timestamps"""
+    new_dict = self.__dict__.copy()
+    for name in ("created_at", "updated_at"):
+        if name in new_dict and type(new_dict[name]) is not str:
+            new_dict[name] = new_dict[name].strftime("%Y-%m-%dT%H:%M:%S.%f")
+    new_dict["__class__"] = self.__class__.__name__
+    if "_sa_instance_state" in new_dict:
+        del new_dict["_sa_instance_state"]
+    return new_dict
+
+
+class TestStreamingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of streaming"""
+    def test_pep8_conformance_streaming(self):
+        """Test that streaming.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/streaming.py',
+                                    'tests/test_api/test_v1/test_views/\
+test_streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_streaming_docstrings(self):
+        """Test for the presence of docstrings in streaming"""
+        self.assertTrue(len(streaming.__doc__) >= 1)
+        self.assertTrue(len(streaming.negotiated.__doc__) >= 1)
+        self.assertTrue(len(streaming.streamed.__doc__) >= 1)
+
+
+class TestStreaming(unittest.TestCase):
+    """Test the streamed responses of the list routes"""
+    @classmethod
+    def setUpClass(cls):
+        """Create a few states"""
+        cls.client = app.test_client()
+        cls.states = [State(name="State {:d}".format(i)) for i in range(3)]
+        for state in cls.states:
+            models.storage.new(state)
+        models.storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the states created by setUpClass"""
+        for state in cls.states:
+            models.storage.delete(state)
+        models.storage.save()
+
+    def test_json_array(self):
+        """Test that the default response is one JSON array"""
+        response = self.client.get("/api/v1/states")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertTrue(response.is_streamed)
+        ids = [state["id"] for state in response.get_json()]
+        for state in self.states:
+            self.assertIn(state.id, ids)
+
+    def test_ndjson(self):
+        """Test that Accept: application/x-ndjson gets one object a line"""
+        response = self.client.get(
+            "/api/v1/states", headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.get_data(as_text=True).splitlines()
+        ids = [json.loads(line)["id"] for line in lines]
+        self.assertEqual(len(ids), models.storage.count(State))
+        for state in self.states:
+            self.assertIn(state.id, ids)
+
+    def test_chunks(self):
+        """Test that streamed sends a JSON array in several chunks"""
+        dicts = ({"n": i} for i in range(2 * streaming.chunk_size + 1))
+        empty = iter([])
+        with app.test_request_context():
+            chunks = list(streaming.streamed(dicts).response)
+            nothing = "".join(streaming.streamed(empty).response)
+        expected = [{"n": i} for i in range(2 * streaming.chunk_size + 1)]
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual(json.loads("".join(chunks)), expected)
+        self.assertEqual(json.loads(nothing), [])
+
+
+@unittest.skipUnless(os.getenv("HBNB_BENCHMARKS", "0") != "0",
+                     "not running benchmarks")
+class TestStreamingBenchmark(unittest.TestCase):
+    """Micro-benchmark for large list responses"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_large_list(self):
+        """Test that listing 20k states beats the strftime to_dict"""
+        client = app.test_client()
+        states = [State(name="State {:d}".format(i)) for i in range(20000)]
+        for state in states:
+            models.storage.new(state)
+        timings = {}
+        try:
+            with mock.patch.object(cache, "cache_bytes", 0):
+                for name, to_dict in (("cached", BaseModel.to_dict),
+                                      ("legacy", legacy_to_dict)):
+                    with mock.patch.object(BaseModel, "to_dict", to_dict):
+                        timings[name] = min(timeit.repeat(
+                            lambda: client.get("/api/v1/states").data,
+                            number=1, repeat=3))
+        finally:
+            for state in states:
+                models.storage.delete(state)
+        self.assertLess(timings["cached"], timings["legacy"])
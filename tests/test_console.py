@@ -1,12 +1,17 @@
 #!/usr/bin/python3
 """
-Contains the class TestConsoleDocs
+Contains the TestConsoleDocs and TestConsoleSearch classes
 """
 
 import console
 import inspect
+import io
+import models
+from models.engine.file_storage import FileStorage
+from models.place import Place
 import pep8
 import unittest
+import unittest.mock
 HBNBCommand = console.HBNBCommand
 
 
@@ -39,3 +44,50 @@ class TestConsoleDocs(unittest.TestCase):
                          "HBNBCommand class needs a docstring")
         self.assertTrue(len(HBNBCommand.__doc__) >= 1,
                         "HBNBCommand class needs a docstring")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestConsoleSearch(unittest.TestCase):
+    """Test the search command of the console"""
+    def setUp(self):
+        """Store three places in an empty file storage"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.places = [Place(id="c", name="Cabin", max_guest=6,
+                             price_by_night=80),
+                       Place(id="a", name="Attic", max_guest=2,
+                             price_by_night=60),
+                       Place(id="b", name="Barn", max_guest=8,
+                             price_by_night=150)]
+        for place in self.places:
+            models.storage.new(place)
+
+    def tearDown(self):
+        """Restore the objects of file storage"""
+        FileStorage._FileStorage__objects = self.saved
+
+    def search(self, arg):
+        """returns what search prints for arg"""
+        with unittest.mock.patch("sys.stdout", new=io.StringIO()) as out:
+            HBNBCommand().onecmd("search " + arg)
+        return out.getvalue()
+
+    def test_ranges_sorted_by_id(self):
+        """Test that the places found are printed in id order"""
+        found = self.search("Place max_guest=4:")
+        self.assertEqual(found, "[{}, {}]\n".format(self.places[2],
+                                                    self.places[0]))
+        found = self.search("Place max_guest=:6 price_by_night=70:")
+        self.assertEqual(found, "[{}]\n".format(self.places[0]))
+        self.assertEqual(self.search("Place max_guest=2"),
+                         "[{}]\n".format(self.places[1]))
+        self.assertEqual(self.search("Place max_guest=9:"), "[]\n")
+
+    def test_invalid(self):
+        """Test that anything but one value or two bounds is rejected"""
+        for arg in ("Place max_guest=1:2:3", "Place max_guest=",
+                    "Place max_guest", "Place max_guest=x",
+                    "Place name=2"):
+            self.assertEqual(self.search(arg), "** invalid range **\n")
+        self.assertEqual(self.search(""), "** class name missing **\n")
+        self.assertEqual(self.search("City"), "** class doesn't exist **\n")
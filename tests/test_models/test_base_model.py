@@ -3,10 +3,13 @@
 from datetime import datetime
 import inspect
 import models
+import os
 import pep8 as pycodestyle
 import time
+import timeit
 import unittest
 from unittest import mock
+from uuid import UUID
 BaseModel = models.base_model.BaseModel
 module_doc = models.base_model.__doc__
 
@@ -110,6 +113,33 @@ class TestBaseModel(unittest.TestCase):
                                  '-[0-9a-f]{12}$')
         self.assertNotEqual(inst1.id, inst2.id)
 
+    def test_new_id(self):
+        """Test that new_id returns distinct version 4 UUID strings"""
+        ids = {models.base_model.new_id() for i in range(1000)}
+        self.assertEqual(len(ids), 1000)
+        for id in ids:
+            uuid = UUID(id)
+            self.assertEqual(uuid.version, 4)
+            self.assertEqual(str(uuid), id)
+
+    def test_kwargs_round_trip(self):
+        """Test that an instance rebuilt from to_dict equals the original"""
+        inst = BaseModel()
+        inst.name = "Holberton"
+        copy = BaseModel(**inst.to_dict())
+        self.assertEqual(copy.id, inst.id)
+        self.assertEqual(copy.created_at, inst.created_at)
+        self.assertEqual(copy.updated_at, inst.updated_at)
+        self.assertEqual(copy.name, "Holberton")
+        self.assertNotIn("__class__", copy.__dict__)
+
+    def test_kwargs_defaults(self):
+        """Test that missing or non-string id and timestamps are filled"""
+        inst = BaseModel(name="Holberton", created_at=None)
+        UUID(inst.id)
+        self.assertIs(type(inst.created_at), datetime)
+        self.assertEqual(inst.created_at, inst.updated_at)
+
     def test_to_dict(self):
         """Test conversion of object attributes to dictionary for json"""
         my_model = BaseModel()
@@ -138,6 +168,23 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_dict_follows_changes(self):
+        """Test that to_dict formats timestamps again once they change"""
+        inst = BaseModel()
+        attrs = set(inst.__dict__)
+        first = inst.to_dict()
+        self.assertEqual(set(inst.__dict__), attrs)
+        inst.updated_at = datetime(2017, 3, 25, 2, 17, 6)
+        second = inst.to_dict()
+        self.assertEqual(second["created_at"], first["created_at"])
+        self.assertEqual(second["updated_at"], "2017-03-25T02:17:06.000000")
+
+    def test_to_dicts(self):
+        """Test that to_dicts returns the to_dict of every instance"""
+        insts = [BaseModel() for i in range(3)]
+        self.assertEqual(list(models.base_model.to_dicts(insts)),
+                         [inst.to_dict() for inst in insts])
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -158,3 +205,34 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+
+@unittest.skipUnless(os.getenv("HBNB_BENCHMARKS", "0") != "0",
+                     "not running benchmarks")
+class TestBaseModelBenchmark(unittest.TestCase):
+    """Micro-benchmark for the construction of instances"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_construct_1m(self):
+        """Test that building 1M instances from kwargs is at least twice
+        as fast per object as the setattr and strptime path it replaced"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        kwargs = BaseModel(name="Holberton").to_dict()
+
+        def legacy():
+            """The kwargs path of BaseModel.__init__ before"""
+            inst = BaseModel.__new__(BaseModel)
+            for key, value in kwargs.items():
+                if key != "__class__":
+                    setattr(inst, key, value)
+            inst.created_at = datetime.strptime(kwargs["created_at"],
+                                                t_format)
+            inst.updated_at = datetime.strptime(kwargs["updated_at"],
+                                                t_format)
+            return inst
+
+        start = timeit.default_timer()
+        for i in range(1000000):
+            BaseModel(**kwargs)
+        fast = (timeit.default_timer() - start) / 1000000
+        slow = min(timeit.repeat(legacy, number=20000, repeat=3)) / 20000
+        self.assertLess(fast * 2, slow)
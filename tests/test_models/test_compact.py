@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompactDocs, TestCompact and TestCompactBenchmark classes
+"""
+
+from datetime import datetime
+import inspect
+import json
+import models
+from models import compact
+from models.engine import file_storage
+from models.review import Review
+import os
+import pep8
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+FileStorage = file_storage.FileStorage
+
+
+class TestCompactDocs(unittest.TestCase):
+    """Tests to check the documentation and style of compact"""
+    def test_pep8_conformance_compact(self):
+        """Test that models/compact.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/compact.py',
+                                    'tests/test_models/test_compact.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_compact_docstrings(self):
+        """Test for the presence of docstrings in compact"""
+        self.assertTrue(len(compact.__doc__) >= 1)
+        funcs = inspect.getmembers(compact, inspect.isfunction)
+        funcs += inspect.getmembers(compact.CompactModel,
+                                    inspect.isfunction)
+        for name, func in funcs:
+            with self.subTest(function=name):
+                self.assertTrue(len(func.__doc__) >= 1)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestCompact(unittest.TestCase):
+    """Test that the compact models behave like the regular ones"""
+    def test_declared_attributes_in_slots(self):
+        """Test that declared attributes leave the __dict__ empty"""
+        review = compact.classes["Review"](text="Nice", place_id="p",
+                                           user_id="u")
+        self.assertIsInstance(review, Review)
+        self.assertEqual(type(review).__name__, "Review")
+        self.assertFalse(review._has("_extra"))
+        self.assertEqual(vars(review), {})
+        review.color_id = 7
+        self.assertTrue(review._has("_extra"))
+        self.assertEqual(vars(review), {"color_id": 7})
+        self.assertEqual(review.to_dict()["color_id"], 7)
+        self.assertEqual(review.text, "Nice")
+        self.assertIs(type(review.created_at), datetime)
+        self.assertEqual(review.created_at, review.updated_at)
+
+    def test_to_dict_round_trip(self):
+        """Test that from_dict(to_dict()) gives the same dictionary"""
+        Place = compact.classes["Place"]
+        place = Place(name="Loft", max_guest=4)
+        place.color = "blue"
+        d = place.to_dict()
+        self.assertEqual(d["__class__"], "Place")
+        self.assertEqual(d["color"], "blue")
+        self.assertNotIn("number_rooms", d)
+        self.assertEqual(Place.from_dict(dict(d)).to_dict(), d)
+        self.assertEqual(place.number_rooms, 0)
+        self.assertEqual(json.loads(json.dumps(d)), d)
+
+    def test_same_as_regular(self):
+        """Test that to_dict and str match those of the regular model"""
+        regular = Review(text="Nice", place_id="p", user_id="u")
+        small = compact.classes["Review"](**regular.to_dict())
+        self.assertEqual(small.to_dict(), regular.to_dict())
+        self.assertTrue(str(small).startswith(
+            "[Review] ({}) {{".format(regular.id)))
+        for key, value in regular.__dict__.items():
+            self.assertIn("'{}': {!r}".format(key, value), str(small))
+
+    def test_interned_foreign_keys(self):
+        """Test that equal foreign keys share one string"""
+        place_id = "".join(["place-", "1"])
+        Review = compact.classes["Review"]
+        first = Review(place_id=place_id)
+        second = Review.from_dict({"place_id": "".join(["place-", "1"])})
+        self.assertIs(first.place_id, second.place_id)
+        self.assertIs(first.place_id, sys.intern("place-1"))
+
+    def test_relationships_and_save(self):
+        """Test the relationship getters and save through storage"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            with mock.patch.object(models, "storage", storage), \
+                    mock.patch.object(storage, "save"):
+                state = compact.classes["State"](name="California")
+                city = compact.classes["City"](name="Fresno")
+                storage.new(state)
+                storage.new(city)
+                city.state_id = state.id
+                self.assertEqual(state.cities, [city])
+                before = city.updated_at
+                city.save()
+                self.assertGreater(city.updated_at, before)
+                self.assertIs(storage.get("City", city.id), city)
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    def test_reindex_on_any_foreign_key_change(self):
+        """Test that setting a foreign key to None or deleting it moves
+        the object out of the relationship"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            with mock.patch.object(models, "storage", storage):
+                state = compact.classes["State"](name="California")
+                city = compact.classes["City"](name="Fresno")
+                storage.new(state)
+                storage.new(city)
+                city.state_id = state.id
+                self.assertEqual(state.cities, [city])
+                city.state_id = None
+                self.assertEqual(state.cities, [])
+                city.state_id = state.id
+                self.assertEqual(state.cities, [city])
+                del city.state_id
+                self.assertEqual(state.cities, [])
+                self.assertEqual(city.state_id, "")
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    def test_reload(self):
+        """Test that reload builds compact models when asked to"""
+        saved = (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects)
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                FileStorage._FileStorage__file_path = os.path.join(
+                    tmp, "file.json")
+                FileStorage._FileStorage__objects = {}
+                storage = FileStorage()
+                review = Review(text="Nice", place_id="p", user_id="u")
+                storage.new(review)
+                storage.save()
+                FileStorage._FileStorage__objects = {}
+                with mock.patch.object(file_storage, "compact_models", True):
+                    storage.reload()
+                loaded = storage.get(Review, review.id)
+                self.assertIsInstance(loaded, compact.CompactModel)
+                self.assertEqual(loaded.to_dict(), review.to_dict())
+                self.assertEqual(list(storage.related(Review, "place_id",
+                                                      "p").values()),
+                                 [loaded])
+            finally:
+                (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects) = saved
+
+
+class TestCompactBenchmark(unittest.TestCase):
+    """Memory benchmark for the compact models"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_memory_per_review(self):
+        """Test that 50k compact reviews take under half the memory"""
+        place_id, user_id = models.base_model.new_id(), \
+            models.base_model.new_id()
+        values = [json.dumps(Review(text="Great stay", place_id=place_id,
+                                    user_id=user_id).to_dict())
+                  for i in range(50000)]
+        sizes = {}
+        for flag in (False, True):
+            with mock.patch.object(file_storage, "compact_models", flag):
+                tracemalloc.start()
+                objs = [file_storage.restore(json.loads(value))
+                        for value in values]
+                sizes[flag] = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                del objs
+        self.assertLess(sizes[True] * 2, sizes[False])
@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+"""
+Contains the TestAmenityBitmapDocs, TestAmenityBitmap and
+TestAmenityBitmapBenchmark classes
+"""
+
+import inspect
+import models
+from models.amenity import Amenity
+from models.engine import bitmap
+from models.engine.file_storage import FileStorage
+from models.place import Place
+import os
+import pep8
+import random
+import timeit
+import unittest
+import unittest.mock
+AmenityBitmap = bitmap.AmenityBitmap
+
+
+class TestAmenityBitmapDocs(unittest.TestCase):
+    """Tests to check the documentation and style of AmenityBitmap class"""
+    def test_pep8_conformance_bitmap(self):
+        """Test that models/engine/bitmap.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/bitmap.py',
+                                    'tests/test_models/test_engine/\
+test_bitmap.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_bitmap_docstrings(self):
+        """Test for the presence of docstrings in the module and class"""
+        self.assertTrue(len(bitmap.__doc__) >= 1)
+        self.assertTrue(len(AmenityBitmap.__doc__) >= 1)
+        for name, func in inspect.getmembers(AmenityBitmap,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestAmenityBitmap(unittest.TestCase):
+    """Test the AmenityBitmap class"""
+    def test_all_of(self):
+        """Test that all_of returns the places having every amenity"""
+        index = AmenityBitmap()
+        index.add("wifi", "loft")
+        index.add("wifi", "cabin")
+        index.add("pool", "cabin")
+        self.assertEqual(index.all_of(["wifi"]), {"loft", "cabin"})
+        self.assertEqual(index.all_of(["wifi", "pool"]), {"cabin"})
+        self.assertEqual(index.all_of(["wifi", "sauna"]), set())
+        self.assertEqual(index.all_of([]), set())
+
+    def test_discard(self):
+        """Test that discard removes a single link"""
+        index = AmenityBitmap()
+        index.add("wifi", "loft")
+        index.add("wifi", "cabin")
+        index.discard("wifi", "loft")
+        index.discard("wifi", "unknown")
+        self.assertEqual(index.all_of(["wifi"]), {"cabin"})
+        index.discard("wifi", "cabin")
+        self.assertEqual(index.bits, {})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_file_storage_follows_place_id(self):
+        """Test that FileStorage keeps the bitmap in step with place_id"""
+        storage = FileStorage()
+        saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            loft, cabin = Place(name="Loft"), Place(name="Cabin")
+            wifi = Amenity(name="Wifi", place_id=loft.id)
+            for obj in (loft, cabin, wifi):
+                storage.new(obj)
+            self.assertEqual(storage.places_with_amenities([wifi.id]),
+                             {loft.id})
+            with unittest.mock.patch.object(models, "storage", storage):
+                wifi.place_id = cabin.id
+            self.assertEqual(storage.places_with_amenities([wifi.id]),
+                             {cabin.id})
+            storage.delete(wifi)
+            self.assertEqual(storage.places_with_amenities([wifi.id]),
+                             set())
+        finally:
+            FileStorage._FileStorage__objects = saved
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_db_storage_rebuilds_on_link_changes(self):
+        """Test that DBStorage rebuilds the bitmap only after a save that
+        changes place_amenity, in this process or another"""
+        from models.city import City
+        from models.engine.db_storage import versions
+        from models.state import State
+        from models.user import User
+        storage = models.storage
+        state = State(name="Bitmap")
+        city = City(name="Bitmap", state_id=state.id)
+        user = User(email="bitmap@hbnb.io", password="pwd")
+        loft = Place(name="Loft", city_id=city.id, user_id=user.id)
+        wifi = Amenity(name="Wifi")
+        for obj in (state, city, user, loft, wifi):
+            storage.new(obj)
+        storage.save()
+        self.assertEqual(storage.places_with_amenities([wifi.id]), set())
+        loft.amenities.append(wifi)
+        storage.save()
+        self.assertEqual(storage.places_with_amenities([wifi.id]),
+                         {loft.id})
+        built = storage._DBStorage__amenity_bits
+        state.name = "Bitmap again"
+        storage.new(State(name="Unrelated"))
+        storage.save()
+        storage.places_with_amenities([wifi.id])
+        self.assertIs(storage._DBStorage__amenity_bits, built)
+        engine = storage._DBStorage__engine
+        with engine.begin() as connection:
+            connection.execute(versions.update().where(
+                versions.c.name == "place_amenity").values(
+                counter=versions.c.counter + 1))
+        storage.close()
+        storage.places_with_amenities([wifi.id])
+        self.assertIsNot(storage._DBStorage__amenity_bits, built)
+        loft = storage.get(Place, loft.id)
+        loft.amenities.remove(loft.amenities[0])
+        storage.save()
+        self.assertEqual(storage.places_with_amenities([wifi.id]), set())
+
+
+@unittest.skipUnless(os.getenv("HBNB_BENCHMARKS", "0") != "0",
+                     "not running benchmarks")
+class TestAmenityBitmapBenchmark(unittest.TestCase):
+    """Benchmark AmenityBitmap against per-amenity sets of place ids"""
+    def test_all_of_beats_set_intersection(self):
+        """Test ANDing 3 of 50 amenities over 100k places"""
+        rand = random.Random(0)
+        index = AmenityBitmap()
+        sets = {}
+        for place in range(100000):
+            place_id = "place-{:d}".format(place)
+            for amenity in rand.sample(range(50), 15):
+                index.add(amenity, place_id)
+                sets.setdefault(amenity, set()).add(place_id)
+        wanted = [3, 17, 41]
+
+        def intersect():
+            """Filter the way places_search did before the bitmap"""
+            found = sorted((sets[amenity] for amenity in wanted), key=len)
+            return found[0].intersection(*found[1:])
+        self.assertEqual(index.all_of(wanted), intersect())
+        bits = min(timeit.repeat(lambda: index.all_of(wanted),
+                                 number=5, repeat=3))
+        self.assertLess(bits, min(timeit.repeat(intersect, number=5,
+                                                repeat=3)))
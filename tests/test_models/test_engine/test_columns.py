@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlaceColumnsDocs, TestPlaceColumns and
+TestPlaceColumnsBenchmark classes
+"""
+
+import inspect
+import models
+from models.engine import columns
+from models.engine.file_storage import FileStorage
+from models.place import Place
+import os
+import pep8
+import random
+import threading
+import timeit
+import unittest
+import unittest.mock
+PlaceColumns = columns.PlaceColumns
+parse_ranges = columns.parse_ranges
+
+
+class TestPlaceColumnsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of PlaceColumns class"""
+    def test_pep8_conformance_columns(self):
+        """Test that models/engine/columns.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/columns.py',
+                                    'tests/test_models/test_engine/\
+test_columns.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_columns_docstrings(self):
+        """Test for the presence of docstrings in the module and class"""
+        self.assertTrue(len(columns.__doc__) >= 1)
+        self.assertTrue(len(parse_ranges.__doc__) >= 1)
+        self.assertTrue(len(PlaceColumns.__doc__) >= 1)
+        for name, func in inspect.getmembers(PlaceColumns,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestPlaceColumns(unittest.TestCase):
+    """Test the PlaceColumns class and parse_ranges"""
+    def test_parse_ranges(self):
+        """Test the accepted forms of a range"""
+        self.assertEqual(parse_ranges({"max_guest": 4}),
+                         {"max_guest": (4, 4)})
+        self.assertEqual(parse_ranges({"max_guest": [2, None]}),
+                         {"max_guest": (2, None)})
+        self.assertEqual(parse_ranges({"latitude": {"max": 37.5}}),
+                         {"latitude": (None, 37.5)})
+        self.assertEqual(parse_ranges({}), {})
+
+    def test_parse_ranges_invalid(self):
+        """Test that bad attributes and bounds raise ValueError"""
+        for ranges in ({"name": 1}, {"max_guest": "4"},
+                       {"max_guest": [1, 2, 3]}, {"max_guest": True},
+                       {"max_guest": [None, "x"]}):
+            with self.assertRaises(ValueError):
+                parse_ranges(ranges)
+
+    def test_select(self):
+        """Test that select keeps the places within every range"""
+        store = PlaceColumns()
+        store.put(Place(id="loft", max_guest=2, price_by_night=120))
+        store.put(Place(id="cabin", max_guest=6, price_by_night=80))
+        store.put(Place(id="barn", max_guest=6, price_by_night=None))
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.select({}), {"loft", "cabin", "barn"})
+        self.assertEqual(store.select({"max_guest": (4, None)}),
+                         {"cabin", "barn"})
+        self.assertEqual(store.select({"max_guest": (4, None),
+                                       "price_by_night": (None, 100)}),
+                         {"cabin"})
+        self.assertEqual(store.select({"price_by_night": (None, None)}),
+                         {"loft", "cabin"})
+        self.assertEqual(store.select({"max_guest": (7, 9)}), set())
+
+    def test_put_updates_and_discard_frees(self):
+        """Test that put overwrites a row and discard frees it for reuse"""
+        store = PlaceColumns()
+        loft = Place(id="loft", max_guest=2)
+        store.put(loft)
+        loft.max_guest = 8
+        store.put(loft)
+        self.assertEqual(store.select({"max_guest": (8, 8)}), {"loft"})
+        store.discard("loft")
+        store.discard("unknown")
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.select({"max_guest": (None, None)}), set())
+        store.put(Place(id="cabin", max_guest=3))
+        self.assertEqual(len(store.ids), 1)
+        self.assertEqual(store.select({"max_guest": (3, 3)}), {"cabin"})
+
+    def test_orders_follow_writes(self):
+        """Test that the sorted values stay in step with put and discard
+        instead of being sorted again, against a scan of the places"""
+        rand = random.Random(0)
+        store = PlaceColumns()
+        places = {}
+        with unittest.mock.patch.object(columns, "numpy", None):
+            for i in range(2000):
+                place_id = "place-{:d}".format(rand.randrange(300))
+                if rand.random() < 0.2:
+                    store.discard(place_id)
+                    places.pop(place_id, None)
+                else:
+                    place = Place(id=place_id,
+                                  max_guest=rand.choice([None, 1, 2, 3, 4]),
+                                  price_by_night=rand.randrange(10))
+                    store.put(place)
+                    places[place_id] = place
+                low, high = rand.choice([(2, None), (None, 3), (2, 2)])
+                expected = {place.id for place in places.values()
+                            if place.max_guest is not None and
+                            (low is None or place.max_guest >= low) and
+                            (high is None or place.max_guest <= high) and
+                            place.price_by_night <= 5}
+                self.assertEqual(store.select({"max_guest": (low, high),
+                                               "price_by_night": (None, 5)}),
+                                 expected)
+                if i == 0:
+                    order = store._PlaceColumns__sorted["max_guest"]
+            self.assertIs(store._PlaceColumns__sorted["max_guest"], order)
+
+    @unittest.skipUnless(columns.numpy, "NumPy is not installed")
+    def test_select_numpy_matches_fallback(self):
+        """Test that the vectorized select finds what the fallback does"""
+        rand = random.Random(0)
+        store = PlaceColumns()
+        for i in range(1000):
+            store.put(Place(id=str(i), max_guest=rand.randrange(1, 12),
+                            latitude=rand.choice([None, rand.uniform(-9, 9)])))
+        ranges = {"max_guest": (4, None), "latitude": (-5, 5)}
+        found = store.select(ranges)
+        with unittest.mock.patch.object(columns, "numpy", None):
+            self.assertEqual(store.select(ranges), found)
+
+    @unittest.skipUnless(columns.numpy, "NumPy is not installed")
+    def test_put_during_select_numpy(self):
+        """Test that puts from another thread do not hit a BufferError
+        on the arrays select is viewing"""
+        store = PlaceColumns()
+        for i in range(10000):
+            store.put(Place(id=str(i), max_guest=i % 12))
+        errors = []
+
+        def writer():
+            """grows the columns while the main thread selects"""
+            try:
+                for i in range(10000, 20000):
+                    store.put(Place(id=str(i), max_guest=i % 12))
+            except BufferError as error:
+                errors.append(error)
+        thread = threading.Thread(target=writer)
+        thread.start()
+        while thread.is_alive():
+            store.select({"max_guest": (4, 8)})
+        thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(store), 20000)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_file_storage_follows_places(self):
+        """Test that FileStorage keeps the columns in step with places"""
+        storage = FileStorage()
+        saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            loft = Place(name="Loft", max_guest=2)
+            cabin = Place(name="Cabin", max_guest=6)
+            storage.new(loft)
+            storage.new(cabin)
+            self.assertEqual(storage.places_in_ranges({"max_guest": (4, 6)}),
+                             {cabin.id})
+            loft.max_guest = 5
+            storage.new(loft)
+            self.assertEqual(storage.places_in_ranges({"max_guest": (4, 6)}),
+                             {loft.id, cabin.id})
+            storage.delete(cabin)
+            self.assertEqual(storage.places_in_ranges({"max_guest": (4, 6)}),
+                             {loft.id})
+        finally:
+            FileStorage._FileStorage__objects = saved
+
+
+@unittest.skipUnless(os.getenv("HBNB_BENCHMARKS", "0") != "0",
+                     "not running benchmarks")
+class TestPlaceColumnsBenchmark(unittest.TestCase):
+    """Benchmark PlaceColumns against filtering Place objects"""
+    def test_select_beats_object_scan(self):
+        """Test two ranges over 100k places"""
+        rand = random.Random(0)
+        store = PlaceColumns()
+        places = []
+        for i in range(100000):
+            place = Place(id="place-{:d}".format(i),
+                          max_guest=rand.randrange(1, 12),
+                          price_by_night=rand.randrange(20, 500),
+                          latitude=rand.uniform(-90, 90))
+            store.put(place)
+            places.append(place)
+        ranges = {"max_guest": (4, None), "price_by_night": (50, 150)}
+
+        def scan():
+            """Filter the way places_search would on the objects"""
+            return {place.id for place in places
+                    if place.max_guest >= 4 and
+                    50 <= place.price_by_night <= 150}
+        self.assertEqual(store.select(ranges), scan())
+        selected = min(timeit.repeat(lambda: store.select(ranges),
+                                     number=3, repeat=3))
+        self.assertLess(selected, min(timeit.repeat(scan, number=3,
+                                                    repeat=3)))
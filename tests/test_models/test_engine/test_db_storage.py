@@ -17,7 +17,11 @@ from models.user import User
 import json
 import os
 import pep8
+import sqlalchemy
+import tempfile
+import timeit
 import unittest
+import unittest.mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -68,6 +72,74 @@ test_db_storage.py'])
                             "{:s} method needs a docstring".format(func[0]))
 
 
+class TestDBStoragePool(unittest.TestCase):
+    """Test the connection pool settings and metrics, against SQLite"""
+    def test_pool_options_defaults(self):
+        """Test the pool arguments used when no variable is set"""
+        with unittest.mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(db_storage.pool_options(),
+                             {"pool_size": 5, "max_overflow": 10,
+                              "pool_recycle": 3600, "pool_timeout": 30,
+                              "pool_pre_ping": True})
+
+    def test_pool_options_from_environment(self):
+        """Test that HBNB_MYSQL_POOL_* variables override the defaults"""
+        env = {"HBNB_MYSQL_POOL_SIZE": "20", "HBNB_MYSQL_MAX_OVERFLOW": "0",
+               "HBNB_MYSQL_POOL_RECYCLE": "60",
+               "HBNB_MYSQL_POOL_TIMEOUT": "1",
+               "HBNB_MYSQL_POOL_PRE_PING": "0"}
+        with unittest.mock.patch.dict(os.environ, env, clear=True):
+            self.assertEqual(db_storage.pool_options(),
+                             {"pool_size": 20, "max_overflow": 0,
+                              "pool_recycle": 60, "pool_timeout": 1,
+                              "pool_pre_ping": False})
+
+    def test_metered_pool_counts_checkouts_and_timeouts(self):
+        """Test that MeteredQueuePool records checkouts, waits, timeouts"""
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = sqlalchemy.create_engine(
+                "sqlite:///" + os.path.join(tmp, "hbnb.db"),
+                poolclass=db_storage.MeteredQueuePool, pool_size=1,
+                max_overflow=0, pool_timeout=0.05, pool_pre_ping=True)
+            first = engine.connect()
+            self.assertEqual(engine.pool.stats()["checked_out"], 1)
+            with self.assertRaises(sqlalchemy.exc.TimeoutError):
+                engine.connect()
+            first.close()
+            with engine.connect() as second:
+                second.execute(sqlalchemy.text("SELECT 1"))
+            stats = engine.pool.stats()
+            engine.dispose()
+        self.assertEqual(stats["checkouts"], 3)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertGreaterEqual(stats["wait_max"], 0.05)
+        self.assertGreaterEqual(stats["wait_total"], stats["wait_max"])
+
+    def test_sqlite_engine_pragmas(self):
+        """Test that sqlite_engine connections run in WAL mode"""
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = db_storage.sqlite_engine(
+                "sqlite:///" + os.path.join(tmp, "hbnb.db"))
+            with engine.connect() as conn:
+                mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+                keys = conn.exec_driver_sql("PRAGMA foreign_keys").scalar()
+            self.assertIsInstance(engine.pool, db_storage.MeteredQueuePool)
+            engine.dispose()
+        self.assertEqual(mode, "wal")
+        self.assertEqual(keys, 1)
+
+    def test_sqlite_engine_in_memory(self):
+        """Test that an in-memory database keeps data across checkouts"""
+        engine = db_storage.sqlite_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+            conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+        with engine.connect() as conn:
+            count = conn.exec_driver_sql("SELECT COUNT(*) FROM t").scalar()
+        self.assertEqual(count, 1)
+
+
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
@@ -104,3 +176,190 @@ class TestFileStorage(unittest.TestCase):
         models.storage.save()
         new_count = models.storage.count()
         self.assertNotEqual(count, new_count)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_missing(self):
+        """Test that get returns None for unknown ids, classes and None"""
+        self.assertIsNone(models.storage.get(State, "not-an-id"))
+        self.assertIsNone(models.storage.get("State", "not-an-id"))
+        self.assertIsNone(models.storage.get(State, None))
+        self.assertIsNone(models.storage.get(None, "not-an-id"))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts(self):
+        """Test that counts matches count for every class"""
+        models.storage.new(State(name='Antioquia'))
+        models.storage.save()
+        counts = models.storage.counts()
+        self.assertEqual(sorted(counts), sorted(classes))
+        for name, value in classes.items():
+            self.assertEqual(counts[name], models.storage.count(value))
+        self.assertEqual(sum(counts.values()), models.storage.count())
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_stream(self):
+        """Test that stream yields the same objects as all"""
+        new_state = State(name='Cundinamarca')
+        models.storage.new(new_state)
+        models.storage.save()
+        streamed = list(models.storage.stream(State, batch_size=2))
+        self.assertIn(new_state, streamed)
+        self.assertCountEqual(streamed, models.storage.all(State).values())
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_load(self):
+        """Test that load fetches relationship paths with the objects"""
+        state = State(name='Boyaca')
+        city = City(name='Tunja', state_id=state.id)
+        models.storage.new(state)
+        models.storage.new(city)
+        models.storage.save()
+        models.storage.close()
+        found = models.storage.all(State, load=("cities.places",))
+        state = found["State." + state.id]
+        self.assertIn("cities", state.__dict__)
+        self.assertEqual([c.id for c in state.cities], [city.id])
+        self.assertIn("places", state.cities[0].__dict__)
+        models.storage.close()
+        city = models.storage.get(City, city.id, load=("state",))
+        self.assertIn("state", city.__dict__)
+        self.assertEqual(city.state.name, 'Boyaca')
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_order_by(self):
+        """Test that all, related and State.cities sort in SQL"""
+        state = State(name='Zulia')
+        cities = [City(name=name, state_id=state.id)
+                  for name in ('Maracaibo', 'Cabimas', 'Ojeda')]
+        for obj in [state] + cities:
+            models.storage.new(obj)
+        models.storage.save()
+        names = [value.name for value in
+                 models.storage.all(State, order_by="name").values()]
+        self.assertEqual(names, sorted(names))
+        found = models.storage.related(City, "state_id", state.id,
+                                       order_by="name")
+        self.assertEqual([city.name for city in found.values()],
+                         ['Cabimas', 'Maracaibo', 'Ojeda'])
+        models.storage.close()
+        state = models.storage.get(State, state.id)
+        self.assertEqual([city.name for city in state.cities],
+                         ['Cabimas', 'Maracaibo', 'Ojeda'])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_related_any_of(self):
+        """Test that related takes a set of values, batched in IN queries"""
+        states = [State(name='Meta'), State(name='Vaupes')]
+        cities = [City(name='Villavicencio', state_id=states[0].id),
+                  City(name='Mitu', state_id=states[1].id)]
+        for obj in states + cities:
+            models.storage.new(obj)
+        models.storage.save()
+        ids = {state.id for state in states} | {"unknown"}
+        with unittest.mock.patch.object(DBStorage, "related_batch", 2):
+            found = models.storage.related(City, "state_id", ids,
+                                           order_by="name")
+        self.assertEqual([city.name for city in found.values()],
+                         ['Mitu', 'Villavicencio'])
+        self.assertEqual(models.storage.related(City, "id", []), {})
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_migrate_up_to_date(self):
+        """Test that migrate creates nothing once the indexes exist"""
+        self.assertEqual(models.storage.migrate(), [])
+        inspector = sqlalchemy.inspect(models.storage._DBStorage__engine)
+        names = {index["name"] for index in inspector.get_indexes("places")}
+        self.assertIn("ix_places_city_id_created_at", names)
+        self.assertIn("ix_places_price_by_night", names)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_version_counts_commits(self):
+        """Test that version moves with every commit, even within the
+        precision of updated_at"""
+        state = State(name='Sucre')
+        state.updated_at = datetime(2017, 4, 14)
+        models.storage.new(state)
+        models.storage.save()
+        before = (models.storage.version(State), models.storage.version())
+        state.name = 'Bolivar'
+        models.storage.save()
+        after = (models.storage.version(State), models.storage.version())
+        self.assertNotEqual(after[0], before[0])
+        self.assertNotEqual(models.storage.version([City, "State"]),
+                            models.storage.version([City]))
+        self.assertNotEqual(after[1], before[1])
+        self.assertEqual(models.storage.version(City),
+                         models.storage.version(City))
+        models.storage.close()
+        self.assertEqual(models.storage.version(State), after[0])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_version_counts_autoflushed_changes(self):
+        """Test that version moves for changes a query flushed before
+        save"""
+        state = State(name='Lima')
+        models.storage.new(state)
+        models.storage.save()
+        before = models.storage.version(State)
+        state.name = 'Callao'
+        self.assertEqual(models.storage.count(State),
+                         models.storage.count(State))
+        models.storage.save()
+        self.assertNotEqual(models.storage.version(State), before)
+
+
+@unittest.skipUnless(os.getenv("HBNB_BENCHMARKS", "0") != "0",
+                     "not running benchmarks")
+class TestDBStorageBenchmark(unittest.TestCase):
+    """Benchmarks of the DBStorage code path, runnable against SQLite"""
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_beats_scanning_all(self):
+        """Test that get by primary key beats scanning all() on 2k rows"""
+        states = [State(name="State {:d}".format(i)) for i in range(2000)]
+        for state in states:
+            models.storage.new(state)
+        models.storage.save()
+        target = states[-1].id
+
+        def scan():
+            """Find the state the way get used to"""
+            for value in models.storage.all(State).values():
+                if value.id == target:
+                    return value
+        get = min(timeit.repeat(lambda: models.storage.get(State, target),
+                                number=20, repeat=3))
+        self.assertLess(get, min(timeit.repeat(scan, number=20, repeat=3)))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_indexes_speed_up_list_by_parent(self):
+        """Test paging the cities of a state out of 10k, with and without
+        ix_cities_state_id_created_at, which migrate creates back"""
+        states = [State(name="State {:d}".format(i)) for i in range(200)]
+        for state in states:
+            models.storage.new(state)
+        for i in range(10000):
+            models.storage.new(City(name="City {:d}".format(i),
+                                    state_id=states[i % 200].id))
+        models.storage.save()
+        engine = models.storage._DBStorage__engine
+        index = [index for index in City.__table__.indexes
+                 if index.name == "ix_cities_state_id_created_at"][0]
+
+        query = sqlalchemy.select(City.id).where(
+            City.state_id == states[7].id).order_by(
+            City.created_at, City.id).limit(20)
+
+        def page():
+            """Run the query of page(), without building the objects"""
+            with engine.connect() as connection:
+                return connection.execute(query).all()
+        self.assertEqual(len(page()), 20)
+        indexed = min(timeit.repeat(page, number=20, repeat=3))
+        models.storage.close()
+        index.drop(engine)
+        try:
+            scanned = min(timeit.repeat(page, number=20, repeat=3))
+        finally:
+            models.storage.close()
+            self.assertEqual(models.storage.migrate(), [index.name])
+        self.assertLess(indexed * 5, scanned)
@@ -10,14 +10,21 @@ from models.engine import file_storage
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models import compact
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 import json
+import multiprocessing
 import os
+import io
 import pep8
+import tempfile
+import timeit
+import tracemalloc
 import unittest
+import unittest.mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -113,6 +120,32 @@ class TestFileStorage(unittest.TestCase):
         with open("file.json", "r") as f:
             js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_keeps_file_mode(self):
+        """Test that save gives a new file.json the umask mode and keeps
+        the mode of an existing one"""
+        saved = (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects)
+        umask = os.umask(0o022)
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                path = os.path.join(tmp, "file.json")
+                FileStorage._FileStorage__file_path = path
+                FileStorage._FileStorage__objects = {}
+                storage = FileStorage()
+                storage.new(State(name="California"))
+                storage.save()
+                self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
+                os.chmod(path, 0o640)
+                storage.new(State(name="Nevada"))
+                storage.compact()
+                self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+            finally:
+                os.umask(umask)
+                (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects) = saved
+
     @unittest.skipIf(models.storage_t == 'db', "not testing db storage")
     def test_get(self):
         """Test that count method is returning a value greater than 0 for a
@@ -131,3 +164,590 @@ class TestFileStorage(unittest.TestCase):
         models.storage.save()
         new_count = models.storage.count()
         self.assertNotEqual(count, new_count)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_missing(self):
+        """Test that get returns None for unknown ids, classes and None"""
+        storage = FileStorage()
+        self.assertIsNone(storage.get(State, "not-an-id"))
+        self.assertIsNone(storage.get("State", "not-an-id"))
+        self.assertIsNone(storage.get(State, None))
+        self.assertIsNone(storage.get(None, "not-an-id"))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_and_count_by_class(self):
+        """Test that all(cls) and count(cls) follow new and delete"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            state = State(name="California")
+            city = City(name="San Francisco")
+            storage.new(state)
+            storage.new(city)
+            self.assertEqual(storage.all(State),
+                             {"State." + state.id: state})
+            self.assertEqual(storage.all("City"), {"City." + city.id: city})
+            self.assertEqual(storage.count(State), 1)
+            self.assertEqual(storage.count(Amenity), 0)
+            self.assertEqual(storage.count(), 2)
+            self.assertEqual(list(storage.stream(State)), [state])
+            self.assertEqual(list(storage.stream()), [state, city])
+            self.assertEqual(storage.counts()["City"], 1)
+            self.assertEqual(storage.counts()["User"], 0)
+            storage.delete(state)
+            self.assertEqual(storage.all(State), {})
+            self.assertEqual(storage.count(State), 0)
+            self.assertEqual(storage.count(), 1)
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_related_follows_foreign_keys(self):
+        """Test that related and the relationship getters follow setattr"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            ca = State(name="California")
+            ny = State(name="New York")
+            city = City(name="San Francisco", state_id=ca.id)
+            for obj in (ca, ny, city):
+                storage.new(obj)
+            with unittest.mock.patch.object(models, "storage", storage):
+                self.assertEqual(ca.cities, [city])
+                self.assertEqual(ny.cities, [])
+                city.state_id = ny.id
+                self.assertEqual(ca.cities, [])
+                self.assertEqual(ny.cities, [city])
+                storage.delete(city)
+                self.assertEqual(ny.cities, [])
+            self.assertEqual(storage.related(City, "name", "San Francisco"),
+                             {})
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_related_any_of(self):
+        """Test that related takes a set of values for one lookup"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            ca, ny, tx = (State(name="California"), State(name="New York"),
+                          State(name="Texas"))
+            cities = [City(name="Fresno", state_id=ca.id),
+                      City(name="Albany", state_id=ny.id),
+                      City(name="Austin", state_id=tx.id)]
+            for obj in [ca, ny, tx] + cities:
+                storage.new(obj)
+            found = storage.related(City, "state_id", {ca.id, ny.id},
+                                    order_by="name")
+            self.assertEqual([city.name for city in found.values()],
+                             ["Albany", "Fresno"])
+            found = storage.related(State, "id", [tx.id, "unknown"])
+            self.assertEqual(list(found.values()), [tx])
+            found = storage.related(City, "name", ("Austin", "Albany"))
+            self.assertEqual(sorted(city.name for city in found.values()),
+                             ["Albany", "Austin"])
+            self.assertEqual(storage.related(City, "state_id", []), {})
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_version_follows_changes(self):
+        """Test that version(cls) changes only when cls objects change"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            state = State(name="California")
+            before = (storage.version(State), storage.version(City),
+                      storage.version())
+            storage.new(state)
+            self.assertNotEqual(storage.version(State), before[0])
+            self.assertEqual(storage.version(City), before[1])
+            self.assertNotEqual(storage.version(), before[2])
+            before = storage.version(State)
+            storage.new(state)
+            self.assertNotEqual(storage.version(State), before)
+            before = storage.version(State)
+            storage.delete(state)
+            self.assertNotEqual(storage.version(State), before)
+            before = storage.version([State, "City"])
+            storage.new(City(name="Fresno"))
+            self.assertNotEqual(storage.version([State, "City"]), before)
+        finally:
+            FileStorage._FileStorage__objects = save
+        self.assertNotEqual(storage.version(State), before)
+
+
+class TestFileStorageReload(unittest.TestCase):
+    """Test the streaming loader used by FileStorage.reload"""
+    def test_iterload_matches_json_load(self):
+        """Test that iterload yields what json.load returns, any chunk size"""
+        data = {"State.1": {"name": "Ca\u00e9 \\\"x\\\"", "n": [1, {}]},
+                "City.2": {"name": "", "state_id": "1"}, "Empty.3": {},
+                "Odd \\\"key\\\".4": 12345678, "Last.5": True}
+        text = json.dumps(data, indent=1)
+        for size in (1, 2, 7, 65536):
+            with self.subTest(size=size):
+                pairs = list(file_storage.iterload(io.StringIO(text), size))
+                self.assertEqual(dict(pairs), data)
+        self.assertEqual(list(file_storage.iterload(io.StringIO(" {} "))),
+                         [])
+
+    def test_iterload_rejects_truncated(self):
+        """Test that iterload raises on a file cut short"""
+        text = json.dumps({"State.1": {"name": "a"}, "State.2": {}})
+        with self.assertRaises(ValueError):
+            list(file_storage.iterload(io.StringIO(text[:-5]), 4))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    @unittest.skipIf(file_storage.compact_models, "restoring compact models")
+    def test_restore_parses_timestamps_lazily(self):
+        """Test that restore keeps timestamps as strings until read"""
+        state = State(name="California")
+        value = state.to_dict()
+        obj = file_storage.restore(dict(value))
+        self.assertIs(type(obj), State)
+        self.assertIs(type(obj.__dict__["created_at"]), str)
+        self.assertEqual(obj.to_dict(), value)
+        self.assertEqual(obj.created_at, state.created_at)
+        self.assertIs(type(obj.__dict__["created_at"]), datetime)
+        self.assertEqual(str(obj), str(state))
+
+    @unittest.skipUnless(file_storage.compact_models,
+                         "not restoring compact models")
+    def test_restore_compact(self):
+        """Test that restore builds the compact class of the same name"""
+        state = State(name="California")
+        value = state.to_dict()
+        obj = file_storage.restore(dict(value))
+        self.assertIs(type(obj), compact.classes["State"])
+        self.assertEqual(obj.to_dict(), value)
+        self.assertEqual(obj.created_at, state.created_at)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_peak_memory(self):
+        """Test that reload holds less memory than json.load plus __init__
+        on 5k objects"""
+        saved = (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects)
+        peaks = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "file.json")
+            _write_reviews(path, 5000)
+            try:
+                FileStorage._FileStorage__file_path = path
+                for name, load in (("eager", lambda: _eager_load(path)),
+                                   ("streaming", _streaming_load)):
+                    tracemalloc.start()
+                    self.assertEqual(len(load()), 5000)
+                    peaks[name] = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+            finally:
+                (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects) = saved
+        self.assertLess(peaks["streaming"], peaks["eager"])
+
+
+class TestFileStorageJournal(unittest.TestCase):
+    """Test the journal mode of the FileStorage class"""
+    def setUp(self):
+        """Point FileStorage at an empty store in journal mode"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__mode)
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp.name,
+                                                           "file.json")
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__mode = "journal"
+        self.storage = FileStorage()
+        self.storage.compact()
+
+    def tearDown(self):
+        """Restore the FileStorage class attributes"""
+        (FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__mode) = self.saved
+        self.tmp.cleanup()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_appends_changes(self):
+        """Test that save only appends the changed objects"""
+        kept = State(name="California")
+        gone = State(name="Nevada")
+        self.storage.new(kept)
+        self.storage.new(gone)
+        self.storage.save()
+        self.storage.delete(gone)
+        kept.name = "Arizona"
+        self.storage.new(kept)
+        self.storage.save()
+        with open(FileStorage._FileStorage__file_path + ".journal") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 4)
+        self.assertEqual(records[-2:],
+                         [{"key": "State." + gone.id, "obj": None},
+                          {"key": "State." + kept.id, "obj": kept.to_dict()}])
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(list(self.storage.all(State)), ["State." + kept.id])
+        self.assertEqual(self.storage.get(State, kept.id).name, "Arizona")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_folds_journal(self):
+        """Test that compact writes a snapshot and removes the journal"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.compact()
+        path = FileStorage._FileStorage__file_path
+        self.assertFalse(os.path.exists(path + ".journal"))
+        with open(path) as f:
+            self.assertEqual(json.load(f),
+                             {"State." + state.id: state.to_dict()})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_ignores_torn_record(self):
+        """Test that reload stops at a partially written journal line"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        with open(FileStorage._FileStorage__file_path + ".journal", "a") as f:
+            f.write('{"key": "State.torn", "obj": {"__cl')
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(list(self.storage.all()), ["State." + state.id])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_keeps_records_of_other_processes(self):
+        """Test that compact folds in what another process journaled"""
+        first = State(name="A-written")
+        self.storage.new(first)
+        self.storage.save()
+        writer = multiprocessing.get_context("fork").Process(
+            target=_journal_one, args=("B-written",))
+        writer.start()
+        writer.join()
+        self.assertEqual(writer.exitcode, 0)
+        second = State(name="A-later")
+        self.storage.new(second)
+        with unittest.mock.patch.object(
+                FileStorage, "_FileStorage__journal_max", 1):
+            self.storage.save()
+        path = FileStorage._FileStorage__file_path
+        self.assertFalse(os.path.exists(path + ".journal"))
+        with open(path) as f:
+            names = sorted(value["name"] for value in json.load(f).values())
+        self.assertEqual(names, ["A-later", "A-written", "B-written"])
+        self.assertEqual(sorted(state.name for state in
+                                self.storage.all(State).values()), names)
+
+
+def _write_reviews(path, count):
+    """Write count reviews with 200 character texts to path"""
+    with open(path, "w") as f:
+        json.dump({"Review." + str(i): Review(text="x" * 200).to_dict()
+                   for i in range(count)}, f)
+
+
+def _eager_load(path):
+    """Load path the way reload used to: json.load, then __init__"""
+    with open(path) as f:
+        jo = json.load(f)
+    return {key: classes[jo[key]["__class__"]](**jo[key]) for key in jo}
+
+
+def _streaming_load():
+    """Load the file of FileStorage with reload into an empty store"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage().reload()
+    return FileStorage._FileStorage__objects
+
+
+def _legacy_to_dict(self):
+    """BaseModel.to_dict as it was before it cached its timestamps"""
+    new_dict = self.__dict__.copy()
+    for name in ("created_at", "updated_at"):
+        if name in new_dict and type(new_dict[name]) is not str:
+            new_dict[name] = new_dict[name].strftime("%Y-%m-%dT%H:%M:%S.%f")
+    new_dict["__class__"] = self.__class__.__name__
+    return new_dict
+
+
+def _journal_one(name):
+    """Reload the store, then journal one new state, from a child process"""
+    storage = FileStorage()
+    storage.reload()
+    storage.new(State(name=name))
+    storage.save()
+
+
+def _write_many(path, mode, rounds):
+    """Save a growing store to path over and over, from a child process"""
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__mode = mode
+    storage = FileStorage()
+    storage.reload()
+    for i in range(rounds):
+        storage.new(State(name="State {:d}".format(i)))
+        storage.save()
+
+
+def _delete_one(path, mode, key):
+    """Reload the store, then delete and save one object, from a child
+    process"""
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__mode = mode
+    storage = FileStorage()
+    storage.reload()
+    storage.delete(storage.all()[key])
+    storage.save()
+
+
+class TestFileStorageConcurrency(unittest.TestCase):
+    """Stress test FileStorage with several writer processes"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_concurrent_writers_keep_file_valid(self):
+        """Test that file.json always parses while 8 processes save"""
+        ctx = multiprocessing.get_context("fork")
+        for mode in ("snapshot", "journal"):
+            with self.subTest(mode=mode), \
+                    tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "file.json")
+                writers = [ctx.Process(target=_write_many,
+                                       args=(path, mode, 40))
+                           for i in range(8)]
+                for writer in writers:
+                    writer.start()
+                reads = 0
+                while any(writer.is_alive() for writer in writers):
+                    if os.path.exists(path):
+                        with open(path) as f:
+                            self.assertIs(type(json.load(f)), dict)
+                        reads += 1
+                for writer in writers:
+                    writer.join()
+                    self.assertEqual(writer.exitcode, 0)
+                self.assertGreater(reads, 0)
+                if os.path.exists(path + ".journal"):
+                    with open(path + ".journal") as f:
+                        for line in f:
+                            self.assertIn("key", json.loads(line))
+                self.assertEqual(os.listdir(tmp).count("file.json"), 1)
+                self.assertEqual([name for name in os.listdir(tmp)
+                                  if name.startswith(".file.json.")], [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_sees_other_processes(self):
+        """Test that close picks up what another process saved"""
+        ctx = multiprocessing.get_context("fork")
+        saved = (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects,
+                 FileStorage._FileStorage__mode)
+        for mode in ("snapshot", "journal"):
+            with self.subTest(mode=mode), \
+                    tempfile.TemporaryDirectory() as tmp:
+                try:
+                    FileStorage._FileStorage__file_path = os.path.join(
+                        tmp, "file.json")
+                    FileStorage._FileStorage__objects = {}
+                    FileStorage._FileStorage__mode = mode
+                    storage = FileStorage()
+                    storage.new(State(name="Mine"))
+                    storage.save()
+                    storage.close()
+                    self.assertEqual(storage.count(State), 1)
+                    writer = ctx.Process(target=_write_many,
+                                         args=(storage._FileStorage__file_path,
+                                               mode, 3))
+                    writer.start()
+                    writer.join()
+                    storage.close()
+                    self.assertEqual(storage.count(State), 4)
+                finally:
+                    (FileStorage._FileStorage__file_path,
+                     FileStorage._FileStorage__objects,
+                     FileStorage._FileStorage__mode) = saved
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_and_compact_see_other_processes_delete(self):
+        """Test that close and compact drop what another process deleted,
+        and keep the changes of this process not saved yet"""
+        ctx = multiprocessing.get_context("fork")
+        saved = (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects,
+                 FileStorage._FileStorage__mode)
+        for mode, step in (("snapshot", "close"), ("journal", "close"),
+                           ("snapshot", "compact"), ("journal", "compact")):
+            with self.subTest(mode=mode, step=step), \
+                    tempfile.TemporaryDirectory() as tmp:
+                try:
+                    path = os.path.join(tmp, "file.json")
+                    FileStorage._FileStorage__file_path = path
+                    FileStorage._FileStorage__objects = {}
+                    FileStorage._FileStorage__mode = mode
+                    storage = FileStorage()
+                    storage.reload()
+                    kept, gone = State(name="Kept"), State(name="Gone")
+                    storage.new(kept)
+                    storage.new(gone)
+                    storage.save()
+                    self.assertEqual(storage.all(State, order_by="name"),
+                                     {"State." + gone.id: gone,
+                                      "State." + kept.id: kept})
+                    writer = ctx.Process(target=_delete_one,
+                                         args=(path, mode,
+                                               "State." + gone.id))
+                    writer.start()
+                    writer.join()
+                    self.assertEqual(writer.exitcode, 0)
+                    mine = State(name="Mine")
+                    storage.new(mine)
+                    if step == "close":
+                        storage.close()
+                        self.assertIsNone(storage.get(State, gone.id))
+                        self.assertIs(storage.get(State, mine.id), mine)
+                        self.assertEqual(
+                            list(storage.all(State, order_by="name")),
+                            ["State." + kept.id, "State." + mine.id])
+                        storage.save()
+                    else:
+                        storage.compact()
+                    FileStorage._FileStorage__objects = {}
+                    storage.reload()
+                    self.assertEqual(sorted(obj.name for obj in
+                                            storage.all(State).values()),
+                                     ["Kept", "Mine"])
+                finally:
+                    (FileStorage._FileStorage__file_path,
+                     FileStorage._FileStorage__objects,
+                     FileStorage._FileStorage__mode) = saved
+
+
+@unittest.skipUnless(os.getenv("HBNB_BENCHMARKS", "0") != "0",
+                     "not running benchmarks")
+class TestFileStorageBenchmark(unittest.TestCase):
+    """Micro-benchmarks for the FileStorage lookup paths"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_latency_is_flat(self):
+        """Test that get costs the same with 1k and with 1M stored objects"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        timings = {}
+        try:
+            for size in (1000, 1000000):
+                target = State(name="Target")
+                FileStorage._FileStorage__objects = {
+                    "State.{:d}".format(i): target for i in range(size)}
+                storage.new(target)
+                timings[size] = min(timeit.repeat(
+                    lambda: storage.get(State, target.id),
+                    number=10000, repeat=5))
+                self.assertIs(storage.get(State, target.id), target)
+        finally:
+            FileStorage._FileStorage__objects = save
+        self.assertLess(timings[1000000], timings[1000] * 10)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal_save_beats_snapshot(self):
+        """Test that saving one change of 100k is cheaper with a journal"""
+        saved = (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects,
+                 FileStorage._FileStorage__mode)
+        timings = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                FileStorage._FileStorage__file_path = os.path.join(
+                    tmp, "file.json")
+                FileStorage._FileStorage__objects = {}
+                storage = FileStorage()
+                for i in range(100000):
+                    storage.new(Review(text="review", place_id=str(i % 97)))
+                storage.compact()
+                review = Review(text="new")
+                for mode in ("snapshot", "journal"):
+                    FileStorage._FileStorage__mode = mode
+                    start = timeit.default_timer()
+                    storage.new(review)
+                    storage.save()
+                    timings[mode] = timeit.default_timer() - start
+            finally:
+                (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects,
+                 FileStorage._FileStorage__mode) = saved
+        self.assertLess(timings["journal"] * 10, timings["snapshot"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_time(self):
+        """Test that reload beats json.load plus __init__ on 5k objects"""
+        saved = (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects)
+        timings = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "file.json")
+            _write_reviews(path, 5000)
+            try:
+                FileStorage._FileStorage__file_path = path
+                for name, load in (("eager", lambda: _eager_load(path)),
+                                   ("streaming", _streaming_load)):
+                    timings[name] = min(timeit.repeat(load, number=1,
+                                                      repeat=3))
+            finally:
+                (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects) = saved
+        self.assertLess(timings["streaming"], timings["eager"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_skips_unchanged_store(self):
+        """Test that close on an unchanged 20k object store is cheap"""
+        saved = (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects)
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                FileStorage._FileStorage__file_path = os.path.join(
+                    tmp, "file.json")
+                FileStorage._FileStorage__objects = {}
+                storage = FileStorage()
+                for i in range(20000):
+                    storage.new(Review(text="x" * 200))
+                storage.save()
+                close = min(timeit.repeat(storage.close, number=1, repeat=5))
+                reload = min(timeit.repeat(storage.reload, number=1,
+                                           repeat=5))
+            finally:
+                (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects) = saved
+        self.assertLess(close * 100, reload)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_100k_throughput(self):
+        """Test that saving 100k objects again beats the strftime to_dict"""
+        saved = (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects)
+        timings = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                FileStorage._FileStorage__file_path = os.path.join(
+                    tmp, "file.json")
+                FileStorage._FileStorage__objects = {}
+                storage = FileStorage()
+                for i in range(100000):
+                    storage.new(Review(text="Great stay", place_id="p",
+                                       user_id="u"))
+                storage.save()
+                timings["cached"] = min(timeit.repeat(storage.save,
+                                                      number=1, repeat=2))
+                with unittest.mock.patch.object(BaseModel, "to_dict",
+                                                _legacy_to_dict):
+                    timings["legacy"] = min(timeit.repeat(
+                        storage.save, number=1, repeat=2))
+            finally:
+                (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__objects) = saved
+        self.assertLess(timings["cached"], timings["legacy"])
@@ -0,0 +1,201 @@
+#!/usr/bin/python3
+"""
+Contains the TestSortedIndexDocs, TestSortedIndex and
+TestSortedIndexBenchmark classes
+"""
+
+import inspect
+import models
+from models.city import City
+from models.engine import ordering
+from models.engine.file_storage import FileStorage
+from models.state import State
+import os
+import pep8
+import random
+import timeit
+import unittest
+import unittest.mock
+SortedIndex = ordering.SortedIndex
+
+
+class Named:
+    """Plain object with the attributes the tests sort by"""
+    def __init__(self, name, group=None):
+        """Instantiate the object"""
+        self.name = name
+        self.group = group
+
+
+class TestSortedIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SortedIndex class"""
+    def test_pep8_conformance_ordering(self):
+        """Test that models/engine/ordering.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/ordering.py',
+                                    'tests/test_models/test_engine/\
+test_ordering.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_ordering_docstrings(self):
+        """Test for the presence of docstrings in the module and class"""
+        self.assertTrue(len(ordering.__doc__) >= 1)
+        self.assertTrue(len(ordering.sort_key.__doc__) >= 1)
+        self.assertTrue(len(SortedIndex.__doc__) >= 1)
+        for name, func in inspect.getmembers(SortedIndex,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Test the SortedIndex class"""
+    def test_keys_sorted(self):
+        """Test that keys are sorted by attribute, None first, then key"""
+        index = SortedIndex("name", objects={"b": Named("Nevada"),
+                                             "a": Named("Nevada"),
+                                             "c": Named("Alaska"),
+                                             "d": Named(None)})
+        self.assertEqual(index.keys(), ["d", "c", "a", "b"])
+
+    def test_mixed_types(self):
+        """Test that None, numbers and strings sort without TypeError"""
+        index = SortedIndex("name", objects={"a": Named("Nevada"),
+                                             "b": Named(5),
+                                             "c": Named(None),
+                                             "d": Named(2.5)})
+        index.add("e", Named(True))
+        self.assertEqual(index.keys(), ["c", "d", "b", "e", "a"])
+
+    def test_add_and_discard(self):
+        """Test that add inserts or moves a key and discard removes it"""
+        index = SortedIndex("name")
+        alaska = Named("Alaska")
+        index.add("a", alaska)
+        index.add("b", Named("Texas"))
+        index.add("c", Named("Ohio"))
+        self.assertEqual(index.keys(), ["a", "c", "b"])
+        alaska.name = "Utah"
+        index.add("a", alaska)
+        self.assertEqual(index.keys(), ["c", "b", "a"])
+        index.discard("b")
+        index.discard("unknown")
+        self.assertEqual(index.keys(), ["c", "a"])
+
+    def test_group_by(self):
+        """Test that group_by keeps one sorted list per group"""
+        index = SortedIndex("name", "group")
+        index.add("a", Named("Reno", "nv"))
+        index.add("b", Named("Austin", "tx"))
+        index.add("c", Named("Elko", "nv"))
+        self.assertEqual(index.keys("nv"), ["c", "a"])
+        self.assertEqual(index.keys("tx"), ["b"])
+        self.assertEqual(index.keys("ca"), [])
+        index.discard("b")
+        self.assertEqual(index.groups.keys(), {"nv"})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_file_storage_follows_changes(self):
+        """Test that FileStorage keeps its sorted views in order"""
+        storage = FileStorage()
+        saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            texas, ohio = State(name="Texas"), State(name="Ohio")
+            storage.new(texas)
+            storage.new(ohio)
+            names = [state.name for state in
+                     storage.all(State, order_by="name").values()]
+            self.assertEqual(names, ["Ohio", "Texas"])
+            alaska = State(name="Alaska")
+            storage.new(alaska)
+            ohio.name = "Utah"
+            storage.new(ohio)
+            storage.delete(texas)
+            names = [state.name for state in
+                     storage.all(State, order_by="name").values()]
+            self.assertEqual(names, ["Alaska", "Utah"])
+            reno = City(name="Reno", state_id=alaska.id)
+            elko = City(name="Elko", state_id=alaska.id)
+            storage.new(reno)
+            storage.new(elko)
+            self.assertEqual([city.name for city in alaska.cities],
+                             ["Elko", "Reno"])
+            with unittest.mock.patch.object(models, "storage", storage):
+                elko.state_id = ohio.id
+            self.assertEqual([city.name for city in alaska.cities],
+                             ["Reno"])
+            self.assertEqual([city.name for city in ohio.cities], ["Elko"])
+        finally:
+            FileStorage._FileStorage__objects = saved
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_file_storage_unsortable_object(self):
+        """Test that an object the sorted view rejects is not half stored"""
+        storage = FileStorage()
+        saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            texas = State(name="Texas")
+            storage.new(texas)
+            storage.all(State, order_by="name")
+            storage.new(State(name=5))
+            storage.new(State(name={"x": 1}))
+            self.assertEqual(storage.count(State), 3)
+            with self.assertRaises(TypeError):
+                storage.new(State(name={"z": 3}))
+            texas.name = {"y": 2}
+            with self.assertRaises(TypeError):
+                storage.new(texas)
+            self.assertEqual(storage.count(State), 3)
+            self.assertEqual(len(storage.all()), 3)
+            self.assertIs(storage.get(State, texas.id), texas)
+            texas.name = "Utah"
+            storage.new(texas)
+            names = [state.name for state in
+                     storage.all(State, order_by="name").values()]
+            self.assertEqual(names, [5, {"x": 1}, "Utah"])
+        finally:
+            FileStorage._FileStorage__objects = saved
+
+
+@unittest.skipUnless(os.getenv("HBNB_BENCHMARKS", "0") != "0",
+                     "not running benchmarks")
+class TestSortedIndexBenchmark(unittest.TestCase):
+    """Benchmark the sorted views of FileStorage against sorted()"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_ordered_all_beats_sorting(self):
+        """Test listing 50k states by name ten times per state added"""
+        storage = FileStorage()
+        saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            rand = random.Random(0)
+            for i in range(50000):
+                storage.new(State(name="State {:08d}".format(
+                    rand.randrange(10 ** 8))))
+
+            def ordered():
+                """List the states from the sorted view"""
+                storage.new(State(name="State"))
+                for i in range(10):
+                    states = list(storage.all(State,
+                                              order_by="name").values())
+                return states
+
+            def by_sorting():
+                """List the states the way the views used to"""
+                storage.new(State(name="State"))
+                for i in range(10):
+                    states = sorted(storage.all(State).values(),
+                                    key=lambda k: k.name)
+                return states
+            self.assertEqual([state.name for state in ordered()],
+                             sorted(state.name for state in
+                                    storage.all(State).values()))
+            views = min(timeit.repeat(ordered, number=1, repeat=3))
+            sorts = min(timeit.repeat(by_sorting, number=1, repeat=3))
+        finally:
+            FileStorage._FileStorage__objects = saved
+        self.assertLess(views * 3, sorts)
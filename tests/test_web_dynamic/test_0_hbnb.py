@@ -0,0 +1,252 @@
+#!/usr/bin/python3
+"""
+Contains the TestHbnbPageDocs, TestFragmentCache, TestHbnbPage,
+TestHbnbPageQueries and TestHbnbPageBenchmark classes
+"""
+
+import importlib
+import inspect
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import pep8
+import shutil
+import sqlalchemy
+import tempfile
+import timeit
+import unittest
+import unittest.mock
+from web_dynamic import assets, fragments
+hbnb = importlib.import_module("web_dynamic.0-hbnb")
+FragmentCache = fragments.FragmentCache
+
+
+class TestHbnbPageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of web_dynamic/0-hbnb"""
+    def test_pep8_conformance_0_hbnb(self):
+        """Test that web_dynamic/0-hbnb.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['web_dynamic/0-hbnb.py',
+                                    'web_dynamic/fragments.py',
+                                    'tests/test_web_dynamic/test_0_hbnb.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_hbnb_docstring(self):
+        """Test for the hbnb docstrings"""
+        self.assertTrue(len(hbnb.hbnb.__doc__) >= 1)
+        self.assertTrue(len(hbnb.render_filters.__doc__) >= 1)
+        self.assertTrue(len(hbnb.render_places.__doc__) >= 1)
+
+    def test_fragments_docstrings(self):
+        """Test for the docstrings of fragments and FragmentCache"""
+        self.assertTrue(len(fragments.__doc__) >= 1)
+        self.assertTrue(len(FragmentCache.__doc__) >= 1)
+        for name, func in inspect.getmembers(FragmentCache,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestFragmentCache(unittest.TestCase):
+    """Test the FragmentCache class"""
+    def test_get_renders_once(self):
+        """Test that a fragment is rendered until a dependency changes"""
+        cache = FragmentCache()
+        calls = []
+
+        def render():
+            """records the call and returns some HTML"""
+            calls.append(1)
+            return "<li>Reno</li>"
+        self.assertEqual(cache.get("cities", ("City",), render),
+                         "<li>Reno</li>")
+        cache.get("cities", ("City",), render)
+        self.assertEqual(len(calls), 1)
+        cache.invalidate("Place")
+        cache.get("cities", ("City",), render)
+        self.assertEqual(len(calls), 1)
+        cache.invalidate("City")
+        cache.get("cities", ("City",), render)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_markup_is_not_escaped(self):
+        """Test that fragments are inserted in pages as HTML"""
+        html = FragmentCache().get("cities", (), lambda: "<li>Reno</li>")
+        self.assertEqual(html.__html__(), "<li>Reno</li>")
+
+    def test_ttl(self):
+        """Test that fragments expire and that a ttl of 0 disables them"""
+        cache = FragmentCache(ttl=0)
+        cache.get("cities", ("City",), lambda: "Reno")
+        self.assertEqual(len(cache), 0)
+        cache.ttl = 60
+        cache.get("cities", ("City",), lambda: "Reno")
+        with unittest.mock.patch("time.monotonic", return_value=1e12):
+            self.assertEqual(cache.get("cities", ("City",), lambda: "Elko"),
+                             "Elko")
+
+    def test_version_change(self):
+        """Test that a fragment is rendered again when its version moves"""
+        counters = {"City": 0, "Place": 0}
+        cache = FragmentCache(version=lambda names: "-".join(
+            str(counters[name]) for name in names))
+        cache.get("cities", ("City",), lambda: "Reno")
+        counters["Place"] += 1
+        self.assertEqual(cache.get("cities", ("City",), lambda: "Elko"),
+                         "Reno")
+        counters["City"] += 1
+        self.assertEqual(cache.get("cities", ("City",), lambda: "Elko"),
+                         "Elko")
+        self.assertEqual(cache.get("cities", ("City",), lambda: "Ely"),
+                         "Elko")
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_change_while_rendering(self):
+        """Test that a fragment is not kept if it may show old objects"""
+        cache = FragmentCache()
+
+        def render():
+            """renders while the cities change"""
+            cache.invalidate("City")
+            return "Reno"
+        cache.get("cities", ("City",), render)
+        self.assertEqual(len(cache), 0)
+
+
+class TestHbnbPage(unittest.TestCase):
+    """Test the /0-hbnb page"""
+    def test_cache_id_is_content_hash(self):
+        """Test that without a build assets are versioned by content"""
+        self.assertEqual(hbnb.manifest.version,
+                         assets.static_digest(hbnb.app.static_folder))
+        folder = tempfile.mkdtemp()
+        try:
+            shutil.copytree(hbnb.app.static_folder, folder,
+                            dirs_exist_ok=True)
+            self.assertEqual(assets.static_digest(folder),
+                             hbnb.manifest.version)
+            with open(os.path.join(folder, "styles", "4-common.css"),
+                      "a") as f:
+                f.write("\n")
+            self.assertNotEqual(assets.static_digest(folder),
+                                hbnb.manifest.version)
+        finally:
+            shutil.rmtree(folder)
+        with unittest.mock.patch.object(hbnb.manifest, "entries", {}):
+            response = hbnb.app.test_client().get('/0-hbnb')
+        self.assertIn("4-common.css?" + hbnb.manifest.version,
+                      response.get_data(as_text=True))
+
+    def test_writes_invalidate_page(self):
+        """Test that a new state shows up once it is saved"""
+        client = hbnb.app.test_client()
+        client.get('/0-hbnb')
+        state = State(name="Yukon")
+        models.storage.new(state)
+        models.storage.save()
+        try:
+            self.assertIn("Yukon", client.get('/0-hbnb').get_data(
+                as_text=True))
+        finally:
+            models.storage.delete(state)
+            models.storage.save()
+        self.assertNotIn("Yukon", client.get('/0-hbnb').get_data(
+            as_text=True))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestHbnbPageQueries(unittest.TestCase):
+    """Count the queries of /0-hbnb over 50 states and 5k cities"""
+    @classmethod
+    def setUpClass(cls):
+        """Create the states, their cities and a few places"""
+        cls.user = User(email="owner@hbnb.io", password="pwd",
+                        first_name="Betty", last_name="Holberton")
+        cls.states = [State(name="State {:02d}".format(i))
+                      for i in range(50)]
+        cls.cities = [City(name="City {:04d}".format(i),
+                           state_id=cls.states[i % 50].id)
+                      for i in range(5000)]
+        cls.places = [Place(name="Place {:d}".format(i), user_id=cls.user.id,
+                            city_id=cls.cities[i].id) for i in range(20)]
+        for obj in [cls.user] + cls.states + cls.cities + cls.places:
+            models.storage.new(obj)
+        models.storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the objects created by setUpClass"""
+        for obj in cls.places + cls.cities + cls.states + [cls.user]:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def test_query_count_is_bounded(self):
+        """Test that the page does not run a query per state or place"""
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, many):
+            """records every statement sent to the database"""
+            statements.append(statement)
+        # the cities are selected 500 states at a time, and each of the two
+        # fragments reads its version
+        batches = -(-models.storage.count(State) // 500)
+        models.storage.close()
+        sqlalchemy.event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = hbnb.app.test_client().get('/0-hbnb')
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", count)
+        self.assertEqual(response.status_code, 200)
+        page = response.get_data(as_text=True)
+        self.assertIn("City 4999", page)
+        self.assertIn("Betty Holberton", page)
+        self.assertLessEqual(len(statements), 3 + batches + 2)
+
+
+@unittest.skipUnless(os.getenv("HBNB_BENCHMARKS", "0") != "0",
+                     "not running benchmarks")
+class TestHbnbPageBenchmark(unittest.TestCase):
+    """Benchmark rendering /0-hbnb with and without the fragment cache"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_cached_render_throughput(self):
+        """Test 20 renders of 50 states, 2k cities and 500 places"""
+        saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            user = User(email="owner@hbnb.io", password="pwd",
+                        first_name="Betty", last_name="Holberton")
+            models.storage.new(user)
+            states = [State(name="State {:02d}".format(i))
+                      for i in range(50)]
+            cities = [City(name="City {:04d}".format(i),
+                           state_id=states[i % 50].id) for i in range(2000)]
+            for obj in states + cities:
+                models.storage.new(obj)
+            for i in range(50):
+                models.storage.new(Amenity(name="Amenity {:d}".format(i)))
+            for i in range(500):
+                models.storage.new(Place(name="Place {:d}".format(i),
+                                         city_id=cities[i].id,
+                                         user_id=user.id,
+                                         description="<p>Quiet</p>"))
+            client = hbnb.app.test_client()
+            page = client.get('/0-hbnb').get_data()
+            with unittest.mock.patch.object(hbnb.fragments, "ttl", 0):
+                self.assertEqual(client.get('/0-hbnb').get_data(), page)
+                rendered = min(timeit.repeat(
+                    lambda: client.get('/0-hbnb'), number=20, repeat=3))
+            cached = min(timeit.repeat(lambda: client.get('/0-hbnb'),
+                                       number=20, repeat=3))
+        finally:
+            FileStorage._FileStorage__objects = saved
+            for name in ("State", "City", "Amenity", "Place", "User"):
+                hbnb.fragments.invalidate(name)
+        self.assertLess(cached * 5, rendered)
@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+"""
+Contains the TestAssetsDocs, TestMinify, TestBuild and TestManifest
+classes
+"""
+
+from flask import Flask, render_template_string
+import gzip
+import inspect
+import json
+import os
+import pep8
+import shutil
+import tempfile
+import unittest
+from web_dynamic import assets
+
+# dictionary - path to content of the static folder the tests build
+files = {"styles/main.css": "/* page */\nbody {\n  color: red;\n"
+                            "  background: url(\"../images/logo.png\");\n"
+                            "}\n.quote::before { content: \"a  ;  b\"; }\n",
+         "scripts/main.js": "// greet\n$(function () {\n  const s = `\n"
+                            "    two  lines`;\n\n  alert(s); // done\n});\n",
+         "styles/grid.css": ".cell {\n  margin: 0 auto;\n}\n" * 50,
+         "images/logo.png": "\x89PNG",
+         "index.html": "<link href=\"styles/main.css\">"
+                       "<img src=\"images/logo.png\"><a href=\"other\">",
+         "README.md": "not an asset"}
+
+
+class TestAssetsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of web_dynamic/assets"""
+    def test_pep8_conformance_assets(self):
+        """Test that web_dynamic/assets.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['web_dynamic/assets.py',
+                                    'tests/test_web_dynamic/test_assets.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_assets_docstrings(self):
+        """Test for the docstrings of the module, functions and Manifest"""
+        self.assertTrue(len(assets.__doc__) >= 1)
+        for name, func in inspect.getmembers(assets, inspect.isfunction):
+            if func.__module__ == assets.__name__:
+                self.assertTrue(len(func.__doc__) >= 1,
+                                "{:s} needs a docstring".format(name))
+        for name, func in inspect.getmembers(assets.Manifest,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestMinify(unittest.TestCase):
+    """Test minify_css and minify_js"""
+    def test_minify_css(self):
+        """Test that comments and whitespace go but strings stay"""
+        self.assertEqual(assets.minify_css(files["styles/main.css"]),
+                         'body{color:red;background:url("../images/logo.png")'
+                         '}.quote::before{content:"a  ;  b"}')
+
+    def test_minify_js(self):
+        """Test that lines are trimmed except inside template literals"""
+        self.assertEqual(assets.minify_js(files["scripts/main.js"]),
+                         "$(function () {\nconst s = `\n    two  lines`;\n"
+                         "alert(s); // done\n});\n")
+
+    def test_fingerprint(self):
+        """Test that the hash of the content goes before the extension"""
+        self.assertEqual(assets.fingerprint("styles/main.css", b""),
+                         "styles/main.e3b0c44298.css")
+
+
+class TestBuild(unittest.TestCase):
+    """Test building a static folder"""
+    def setUp(self):
+        """Write files into a temporary static folder"""
+        self.source = tempfile.mkdtemp()
+        for path, content in files.items():
+            path = os.path.join(self.source, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="latin-1") as f:
+                f.write(content)
+        self.target = os.path.join(self.source, "build")
+
+    def tearDown(self):
+        """Remove the temporary folder"""
+        shutil.rmtree(self.source)
+
+    def test_build(self):
+        """Test the manifest, the built files and their references"""
+        manifest = assets.build(self.source, self.target)
+        self.assertEqual(sorted(manifest), ["images/logo.png",
+                                            "scripts/main.js",
+                                            "styles/grid.css",
+                                            "styles/main.css"])
+        with open(os.path.join(self.target, "manifest.json")) as f:
+            self.assertEqual(json.load(f), manifest)
+        css = os.path.join(self.target, manifest["styles/main.css"])
+        with open(css) as f:
+            self.assertIn('url("../' + manifest["images/logo.png"] + '")',
+                          f.read())
+        self.assertFalse(os.path.exists(css + ".gz"))
+        grid = os.path.join(self.target, manifest["styles/grid.css"])
+        with gzip.open(grid + ".gz") as f:
+            with open(grid, "rb") as raw:
+                self.assertEqual(f.read(), raw.read())
+        self.assertFalse(os.path.exists(os.path.join(
+            self.target, manifest["images/logo.png"] + ".gz")))
+        with open(os.path.join(self.target, "index.html")) as f:
+            self.assertEqual(f.read(), '<link href="{}"><img src="{}">'
+                             '<a href="other">'.format(
+                                 manifest["styles/main.css"],
+                                 manifest["images/logo.png"]))
+
+    def test_build_is_repeatable(self):
+        """Test that a second build, over the first, writes the same"""
+        first = assets.build(self.source, self.target)
+        css = os.path.join(self.target, first["styles/grid.css"]) + ".gz"
+        with open(css, "rb") as f:
+            compressed = f.read()
+        self.assertEqual(assets.build(self.source, self.target), first)
+        with open(css, "rb") as f:
+            self.assertEqual(f.read(), compressed)
+
+
+class TestManifest(TestBuild):
+    """Test serving a build through Manifest"""
+    def setUp(self):
+        """Build the temporary static folder for a new app"""
+        super().setUp()
+        self.manifest = assets.build(self.source, self.target)
+        self.app = Flask(__name__, static_folder=self.source,
+                         static_url_path="/static")
+        assets.Manifest(self.app, self.target)
+        self.client = self.app.test_client()
+
+    def test_asset_url(self):
+        """Test that asset_url points at the built or the static file"""
+        with self.app.test_request_context():
+            self.assertEqual(
+                render_template_string("{{ asset_url('styles/main.css') }}"),
+                "/assets/" + self.manifest["styles/main.css"])
+            self.assertEqual(
+                render_template_string("{{ asset_url('index.html') }}"),
+                "/static/index.html?" + assets.static_digest(self.source))
+
+    def test_send(self):
+        """Test that built assets are precompressed and kept for a year"""
+        url = "/assets/" + self.manifest["styles/grid.css"]
+        response = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.mimetype, "text/css")
+        self.assertIn("immutable", response.headers["Cache-Control"])
+        self.assertIn("max-age=31536000", response.headers["Cache-Control"])
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertIn(b".cell{margin:0 auto}",
+                      gzip.decompress(response.get_data()))
+        response.close()
+        response = self.client.get(url)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn(b".cell{margin:0 auto}", response.get_data())
+        response.close()
+
+    def test_send_unknown(self):
+        """Test that only the files of the manifest are served"""
+        for url in ("/assets/manifest.json", "/assets/styles/main.css",
+                    "/assets/../index.html"):
+            self.assertEqual(self.client.get(url).status_code, 404)
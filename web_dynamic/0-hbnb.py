@@ -5,12 +5,23 @@ from models.state import State
 from models.city import City
 from models.amenity import Amenity
 from models.place import Place
-from os import environ
+from os import environ, getenv
+import os
 from flask import Flask, render_template
-import uuid
+from web_dynamic.assets import Manifest
+from web_dynamic.fragments import FragmentCache
 app = Flask(__name__)
 # app.jinja_env.trim_blocks = True
 # app.jinja_env.lstrip_blocks = True
+# Manifest - asset_url() of the templates, pointing at the fingerprinted
+# files of python3 -m web_dynamic.assets if it was run
+manifest = Manifest(app, os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), 'build'))
+# float - seconds a fragment is kept at most, 0 disables the cache; the
+# writes of other processes are caught by the storage version
+cache_ttl = float(getenv('HBNB_WEB_CACHE_TTL', '60'))
+fragments = FragmentCache(cache_ttl, storage.version)
+storage.subscribe(fragments.invalidate)
 
 
 @app.teardown_appcontext
@@ -22,24 +33,32 @@ def close_db(error):
 @app.route('/0-hbnb', strict_slashes=False)
 def hbnb():
     """ HBNB is alive! """
-    states = storage.all(State).values()
-    states = sorted(states, key=lambda k: k.name)
+    return render_template('0-hbnb.html',
+                           filters=fragments.get(
+                               'filters', ('State', 'City', 'Amenity'),
+                               render_filters),
+                           places=fragments.get(
+                               'places', ('Place', 'User'), render_places))
+
+
+def render_filters():
+    """ Renders the states, their cities and the amenities to filter by """
+    states = storage.all(State, load=("cities",), order_by="name").values()
     st_ct = []
 
     for state in states:
-        st_ct.append([state, sorted(state.cities, key=lambda k: k.name)])
+        st_ct.append([state, state.cities])
 
-    amenities = storage.all(Amenity).values()
-    amenities = sorted(amenities, key=lambda k: k.name)
+    amenities = storage.all(Amenity, order_by="name").values()
+    return render_template('0-hbnb-filters.html',
+                           states=st_ct,
+                           amenities=amenities)
 
-    places = storage.all(Place).values()
-    places = sorted(places, key=lambda k: k.name)
 
-    return render_template('0-hbnb.html',
-                           states=st_ct,
-                           amenities=amenities,
-                           places=places,
-                           cache_id=uuid.uuid4())
+def render_places():
+    """ Renders the articles of the places """
+    places = storage.all(Place, load=("user",), order_by="name").values()
+    return render_template('0-hbnb-places.html', places=places)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,249 @@
+#!/usr/bin/python3
+"""
+Versioning, minification and precompression of the static assets of the
+web_dynamic pages and of web_static
+
+Usage: python3 -m web_dynamic.assets [source target]
+builds web_dynamic/static into web_dynamic/build by default
+"""
+
+from flask import abort, request, send_from_directory, url_for
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import sys
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# tuple - extensions of the text assets worth precompressing
+compressible = (".css", ".html", ".js", ".json", ".svg", ".txt")
+# tuple - extensions of the source files that are not assets
+skipped = (".md", ".py", ".pyc")
+# integer - hex digits of the content hash put in built file names
+hash_length = 10
+# string - name of the manifest written at the root of a build
+manifest_name = "manifest.json"
+# integer - seconds browsers may keep a fingerprinted asset
+max_age = 31536000
+# regular expressions - quoted strings and comments of CSS, references
+# to other files in CSS and in HTML pages
+css_tokens = re.compile(r'("(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|'
+                        r'/\*.*?\*/)', re.S)
+css_urls = re.compile(r'url\(\s*(["\']?)([^"\')\s]+)\1\s*\)')
+html_urls = re.compile(r'((?:href|src)=)(["\'])([^"\']+)\2')
+
+
+def static_digest(folder):
+    """
+    Returns a short hash of the paths and contents of every file under
+    folder, which only changes when an asset does, so that browsers can
+    keep the assets until then.
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, folder).encode() + b"\0")
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:12]
+
+
+def minify_css(text):
+    """
+    Returns CSS without comments and with whitespace only where it is
+    needed; quoted strings are kept as they are.
+    """
+    parts = css_tokens.split(text)
+    for i in range(0, len(parts), 2):
+        part = re.sub(r"\s+", " ", parts[i])
+        part = re.sub(r" ?([{};,>]) ?", r"\1", part)
+        parts[i] = part.replace(": ", ":").replace(";}", "}")
+    for i in range(1, len(parts), 2):
+        if parts[i].startswith("/*"):
+            parts[i] = ""
+    return "".join(parts).strip()
+
+
+def minify_js(text):
+    """
+    Returns JavaScript with its lines trimmed and without blank lines or
+    lines holding only a // comment. Line breaks are kept since they may
+    end statements, lines inside template literals are kept as they are,
+    and comments after code are left alone as telling them from strings
+    or regular expressions needs a parser.
+    """
+    lines = []
+    literal = False
+    for line in text.splitlines():
+        opens = literal
+        literal ^= len(re.findall(r"(?<!\\)`", line)) % 2 == 1
+        if not opens:
+            line = line.lstrip()
+            if not line or line.startswith("//"):
+                continue
+        if not literal:
+            line = line.rstrip()
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def fingerprint(path, data):
+    """returns path with the content hash of data before its extension"""
+    stem, ext = posixpath.splitext(path)
+    return "{}.{}{}".format(stem,
+                            hashlib.sha256(data).hexdigest()[:hash_length],
+                            ext)
+
+
+def precompress(path, data):
+    """
+    writes path.gz, and path.br if brotli is installed, when they are
+    smaller than data; gzip without a timestamp so builds are repeatable
+    """
+    encoded = [(".gz", gzip.compress(data, 9, mtime=0))]
+    if brotli is not None:
+        encoded.append((".br", brotli.compress(data)))
+    for ext, body in encoded:
+        if len(body) < len(data):
+            with open(path + ext, "wb") as f:
+                f.write(body)
+
+
+def rewrite(pattern, text, path, manifest, group):
+    """
+    returns text with the references matched by pattern, relative to the
+    file path, replaced by their built names when manifest has them
+    """
+    folder = posixpath.dirname(path)
+
+    def replace(match):
+        """returns the match with its reference replaced"""
+        ref = match.group(group)
+        name = posixpath.normpath(posixpath.join(folder, ref))
+        if name not in manifest:
+            return match.group(0)
+        built = posixpath.relpath(manifest[name], folder or ".")
+        start, end = match.span(group)
+        offset = match.start(0)
+        whole = match.group(0)
+        return whole[:start - offset] + built + whole[end - offset:]
+    return pattern.sub(replace, text)
+
+
+def build(source, target):
+    """
+    Builds the assets of source into target and returns the manifest,
+    {source path: built path}, also written to target/manifest.json:
+    CSS is minified and its url() pointed at the built files, JavaScript
+    is minified, and every asset is written under a name holding its
+    content hash, next to its .gz and .br. HTML pages keep their names,
+    their links being pointed at the built files.
+    """
+    source = os.path.abspath(source)
+    target = os.path.abspath(target)
+    files = []
+    for root, dirs, names in os.walk(source):
+        dirs[:] = sorted(name for name in dirs
+                         if os.path.join(root, name) != target)
+        for name in sorted(names):
+            if name.endswith(skipped):
+                continue
+            path = os.path.relpath(os.path.join(root, name), source)
+            files.append(path.replace(os.sep, "/"))
+    order = {".css": 1, ".js": 1, ".html": 2}
+    files.sort(key=lambda path: order.get(posixpath.splitext(path)[1], 0))
+    manifest = {}
+    for path in files:
+        ext = posixpath.splitext(path)[1]
+        with open(os.path.join(source, path), "rb") as f:
+            data = f.read()
+        if ext == ".css":
+            text = rewrite(css_urls, data.decode(), path, manifest, 2)
+            data = minify_css(text).encode()
+        elif ext == ".js":
+            data = minify_js(data.decode()).encode()
+        elif ext == ".html":
+            text = rewrite(html_urls, data.decode(), path, manifest, 3)
+            data = text.encode()
+        built = path if ext == ".html" else fingerprint(path, data)
+        out = os.path.join(target, built)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        with open(out, "wb") as f:
+            f.write(data)
+        if ext in compressible:
+            precompress(out, data)
+        if ext != ".html":
+            manifest[path] = built
+    with open(os.path.join(target, manifest_name), "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+
+class Manifest:
+    """
+    Gives the templates of a Flask app asset_url(filename), the URL of
+    the built asset listed in the manifest of folder, and serves those
+    assets for a year, as .br or .gz when the browser accepts them.
+    Without a build, asset_url falls back to the static route with the
+    static_digest of the static folder as query string.
+    """
+
+    def __init__(self, app, folder, prefix="/assets"):
+        """Instantiate the manifest of folder and register it on app"""
+        self.folder = folder
+        self.entries = {}
+        path = os.path.join(folder, manifest_name)
+        if os.path.isfile(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+        self.built = set(self.entries.values())
+        self.version = static_digest(app.static_folder)
+        app.add_url_rule(prefix + "/<path:filename>", "assets", self.send)
+        app.jinja_env.globals["asset_url"] = self.url
+
+    def url(self, filename):
+        """returns the URL of the asset filename of the static folder"""
+        built = self.entries.get(filename)
+        if built is None:
+            return url_for("static", filename=filename) + "?" + self.version
+        return url_for("assets", filename=built)
+
+    def send(self, filename):
+        """serves a built asset, precompressed if the browser accepts it"""
+        if filename not in self.built:
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0]
+        response = None
+        for encoding, ext in (("br", ".br"), ("gzip", ".gz")):
+            if request.accept_encodings[encoding] and \
+                    os.path.isfile(os.path.join(self.folder, filename + ext)):
+                response = send_from_directory(self.folder, filename + ext,
+                                               mimetype=mimetype)
+                response.headers["Content-Encoding"] = encoding
+                break
+        if response is None:
+            response = send_from_directory(self.folder, filename)
+        response.headers["Vary"] = "Accept-Encoding"
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = True
+        return response
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        source, target = sys.argv[1:]
+    else:
+        here = os.path.dirname(os.path.abspath(__file__))
+        source = os.path.join(here, "static")
+        target = os.path.join(here, "build")
+    for path, built in sorted(build(source, target).items()):
+        print("{} -> {}".format(path, built))
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Cache of the rendered HTML fragments of the web_dynamic pages
+"""
+
+from markupsafe import Markup
+import threading
+import time
+
+
+class FragmentCache:
+    """
+    Keeps rendered fragments by name, each dropped as soon as storage
+    reports a change to one of the classes it was rendered from, and
+    rendered again when version(deps) moves, which also catches the
+    writes of other processes, or ttl seconds after it was rendered.
+    """
+
+    def __init__(self, ttl=60.0, version=None):
+        """Instantiate an empty cache"""
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # callable - returns the storage version of a list of class names,
+        # None to rely on invalidate and the ttl only
+        self.version = version
+        # dictionary - name to (expiry time, deps, version, html)
+        self.__fragments = {}
+        # integer - incremented by invalidate, so that a fragment rendered
+        # while a class changed is not stored
+        self.__generation = 0
+        self.__lock = threading.Lock()
+
+    def get(self, name, deps, render):
+        """
+        Returns the fragment name as Markup, calling render() to build it
+        if it is missing or stale.
+        Args:
+            name (str): Name of the fragment.
+            deps (tuple): Names of the classes the fragment shows.
+            render (callable): Returns the HTML of the fragment.
+        """
+        if self.ttl <= 0:
+            return Markup(render())
+        with self.__lock:
+            entry = self.__fragments.get(name)
+            generation = self.__generation
+        # read before rendering, so that a write made meanwhile moves it
+        version = self.version(list(deps)) if self.version else None
+        if entry is not None and entry[0] >= time.monotonic() and \
+                entry[2] == version:
+            self.hits += 1
+            return entry[3]
+        self.misses += 1
+        html = Markup(render())
+        with self.__lock:
+            if generation == self.__generation:
+                self.__fragments[name] = (time.monotonic() + self.ttl,
+                                          frozenset(deps), version, html)
+        return html
+
+    def invalidate(self, name):
+        """drops every fragment showing objects of class name"""
+        with self.__lock:
+            self.__generation += 1
+            for key, entry in list(self.__fragments.items()):
+                if name in entry[1]:
+                    del self.__fragments[key]
+
+    def __len__(self):
+        """returns the number of fragments, expired or not"""
+        return len(self.__fragments)
@@ -12,8 +12,8 @@ app = Flask(__name__)
 @app.route('/hbnb_filters', strict_slashes=False)
 def filters():
     """display a HTML page like 6-index.html from static"""
-    states = storage.all("State").values()
-    amenities = storage.all("Amenity").values()
+    states = storage.all("State", order_by="name").values()
+    amenities = storage.all("Amenity", order_by="name").values()
     return render_template('10-hbnb_filters.html', states=states,
                            amenities=amenities)
 